@@ -0,0 +1,67 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+"""
+Compare l'enregistrement d'un ABR sous forme texte (str / from_prefix) et
+sous forme binaire (save_binary / load_binary), puis le coût d'une vue
+AbrMmap : ouverture et 1000 recherches sans reconstruire l'arbre.
+
+usage : python benchmarks/bench_binary.py [taille_max]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from abr import Abr
+from abr_mmap import AbrMmap
+
+
+def chrono(f, *args):
+    debut = time.perf_counter()
+    res = f(*args)
+    return res, (time.perf_counter() - debut) * 1000
+
+
+def texte(arbre, fichier):
+    with open(fichier, 'w') as sortie:
+        sortie.write(str(arbre))
+
+def relitTexte(fichier, substitutions):
+    with open(fichier) as source:
+        return Abr.from_prefix(source.read(), substitutions)
+
+def sondeMmap(fichier, sondes):
+    with AbrMmap(fichier) as vue:
+        return sum(vue.recherche(x) for x in sondes)
+
+
+def main(tailleMax):
+    dossier = tempfile.mkdtemp()
+    fichierTexte = os.path.join(dossier, 'abr.txt')
+    fichierBinaire = os.path.join(dossier, 'abr.bin')
+    print("Size\t|text (bytes)\t|binary (bytes)\t|text save/load (ms)\t|binary save/load (ms)\t|mmap open+1000 searches (ms)")
+    taille = 1000
+    while taille <= tailleMax:
+        cles = list(range(taille))
+        random.shuffle(cles)
+        arbre = Abr.from_iterable(cles)
+        substitutions = {str(k): k for k in cles}
+        substitutions[''] = Abr()
+        t_ecrit = chrono(texte, arbre, fichierTexte)[1]
+        relu, t_lit = chrono(relitTexte, fichierTexte, substitutions)
+        assert relu == arbre
+        t_ecrit_bin = chrono(arbre.save_binary, fichierBinaire)[1]
+        relu, t_lit_bin = chrono(Abr.load_binary, fichierBinaire)
+        assert relu == arbre
+        trouves, t_mmap = chrono(sondeMmap, fichierBinaire, random.sample(range(2 * taille), 1000))
+        print("{}\t|{}\t|{}\t|{:0.1f} / {:0.1f}\t\t|{:0.1f} / {:0.1f}\t\t|{:0.2f}".format(
+            taille, os.path.getsize(fichierTexte), os.path.getsize(fichierBinaire),
+            t_ecrit, t_lit, t_ecrit_bin, t_lit_bin, t_mmap))
+        taille *= 10
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000000)
@@ -0,0 +1,61 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+"""
+Coût de l'import des modules du projet, mesuré dans un interpréteur neuf :
+durée de l'import, mémoire maximale du processus, et bibliothèques lourdes
+(graphviz, matplotlib, scipy, pandas, numpy) chargées au passage. Celles-ci
+ne doivent l'être qu'à leur première utilisation ; le script se termine en
+erreur si l'une d'elles est importée par un module de la liste.
+
+usage : python benchmarks/bench_import.py [repetitions]
+"""
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+MODULES = ['binary_tree', 'abr', 'abr_equilibre', 'simulation', 'main']
+HEAVY = ['graphviz', 'matplotlib', 'scipy', 'pandas', 'numpy']
+
+# exécuté par chaque interpréteur neuf
+CHILD = '''
+import json, resource, sys, time
+debut = time.perf_counter()
+import {module}
+duree = time.perf_counter() - debut
+print(json.dumps({{"ms": duree * 1000, "maxrss_kib": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+                  "heavy": [m for m in {heavy!r} if m in sys.modules]}}))
+'''
+
+
+def mesure(module):
+    '''
+    return the dict (ms, maxrss_kib, heavy) of the import of module in a new interpreter
+    '''
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(p for p in (SRC, env.get('PYTHONPATH')) if p)
+    sortie = subprocess.run([sys.executable, '-c', CHILD.format(module=module, heavy=HEAVY)],
+                            env=env, capture_output=True, text=True, check=True).stdout
+    return json.loads(sortie)
+
+
+def main(repetitions):
+    fautifs = []
+    print("Module\t\t|Import (ms, median)\t|Max RSS (MiB)\t|Heavy modules loaded")
+    for module in MODULES:
+        mesures = [mesure(module) for i in range(repetitions)]
+        lourds = mesures[0]["heavy"]
+        if lourds:
+            fautifs.append(module)
+        print("{}\t|{:0.1f}\t\t\t|{:0.1f}\t\t|{}".format(
+            module.ljust(12), statistics.median(m["ms"] for m in mesures),
+            statistics.median(m["maxrss_kib"] for m in mesures) / 1024, ", ".join(lourds) or "-"))
+    if fautifs:
+        print("heavy dependencies imported at load time by: " + ", ".join(fautifs))
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5)
@@ -0,0 +1,51 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+"""
+Coût moyen d'une insertion dans un Abr aléatoire, avec le constructeur de
+confiance et en mode paranoïaque (validation complète à chaque nœud).
+
+Avec le constructeur de confiance, le temps par insertion suit la hauteur
+de l'arbre (O(h)) ; en mode paranoïaque, il croît avec la taille (O(n·h)).
+
+usage : python benchmarks/bench_insere.py [taille_max]
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from abr import Abr
+
+
+def tempsInsertion(taille, paranoiaque):
+    '''
+    return the mean time (in µs) of one insertion while building a random tree of the given size
+    '''
+    l = list(range(taille))
+    random.shuffle(l)
+    Abr.paranoiaque = paranoiaque
+    try:
+        abr = Abr()
+        debut = time.perf_counter()
+        for elt in l:
+            abr = abr.insere(elt)
+        duree = time.perf_counter() - debut
+    finally:
+        Abr.paranoiaque = False
+    return duree / taille * 1e6, abr.hauteur()
+
+
+def main(tailleMax):
+    print("Size\t|Height\t|Trusted (µs/insert)\t|Paranoid (µs/insert)")
+    taille = 10
+    while taille <= tailleMax:
+        confiance, hauteur = tempsInsertion(taille, False)
+        paranoiaque = tempsInsertion(taille, True)[0] if taille <= 2000 else float('nan')
+        print("{}\t|{}\t|{:0.2f}\t\t\t|{:0.2f}".format(taille, hauteur, confiance, paranoiaque))
+        taille *= 10
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10000)
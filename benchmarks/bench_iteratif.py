@@ -0,0 +1,181 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+"""
+Compare les versions itératives des algorithmes d'Abr/BinaryTree à leurs
+anciennes versions récursives, reproduites ci-dessous comme référence.
+
+Sur un arbre aléatoire, on mesure le gain dû à l'absence d'appels
+récursifs ; sur un peigne (insertions triées), les versions récursives
+lèvent RecursionError dès que la profondeur dépasse la limite de Python.
+Avant les mesures, les résultats des deux versions sont comparés, quand la
+version récursive peut aller au bout.
+
+usage : python benchmarks/bench_iteratif.py [taille]
+"""
+import os
+import random
+import re
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from abr import Abr
+from binary_tree import BLACK, WHITE, escape_str
+
+
+def insereRec(arbre, elt):
+    if arbre.is_empty():
+        return Abr._noeud(elt, Abr(), Abr())
+    elif elt <= arbre.get_data():
+        return Abr._noeud(arbre.get_data(), insereRec(arbre.get_left_subtree(), elt), arbre.get_right_subtree())
+    else:
+        return Abr._noeud(arbre.get_data(), arbre.get_left_subtree(), insereRec(arbre.get_right_subtree(), elt))
+
+def rechercheRec(arbre, elt):
+    if arbre.is_empty():
+        return False
+    elif elt == arbre.get_data():
+        return True
+    elif elt <= arbre.get_data():
+        return rechercheRec(arbre.get_left_subtree(), elt)
+    else:
+        return rechercheRec(arbre.get_right_subtree(), elt)
+
+def ordreInfixeRec(arbre):
+    if arbre.is_empty():
+        return []
+    return ordreInfixeRec(arbre.get_left_subtree()) + [arbre.get_data()] + ordreInfixeRec(arbre.get_right_subtree())
+
+def supprimeRec(arbre, elt):
+    if arbre.is_empty():
+        return arbre
+    elif elt < arbre.get_data():
+        return Abr._noeud(arbre.get_data(), supprimeRec(arbre.get_left_subtree(), elt), arbre.get_right_subtree())
+    elif elt > arbre.get_data():
+        return Abr._noeud(arbre.get_data(), arbre.get_left_subtree(), supprimeRec(arbre.get_right_subtree(), elt))
+    elif arbre.get_left_subtree().is_empty():
+        return arbre.get_right_subtree()
+    else:
+        elt_max = arbre.get_left_subtree().maximum()
+        return Abr._noeud(elt_max, supprimeRec(arbre.get_left_subtree(), elt_max), arbre.get_right_subtree())
+
+def egalRec(arbre1, arbre2):
+    if arbre1.is_empty() or arbre2.is_empty():
+        return arbre1.is_empty() and arbre2.is_empty()
+    return (arbre1.get_data() == arbre2.get_data() and
+            egalRec(arbre1.get_left_subtree(), arbre2.get_left_subtree()) and
+            egalRec(arbre1.get_right_subtree(), arbre2.get_right_subtree()))
+
+def strRec(arbre):
+    if arbre.is_empty():
+        return '()'
+    return '({:s}, {:s}, {:s})'.format(str(arbre.get_data()), strRec(arbre.get_left_subtree()),
+                                       strRec(arbre.get_right_subtree()))
+
+def toDotRec(arbre, background_color=WHITE, prefixe=''):
+    '''
+    return the node and link lines of the DOT description of arbre, node ids being the paths from the root
+    '''
+    lien = '\t"N({:s})" -> "N({:s})" [color="{:s}", label="{:s}", fontsize="8"];\n'
+    if arbre.is_empty():
+        return '\t"N({:s})" [color="{:s}", label=""];\n'.format(prefixe, background_color)
+    descr = '\t"N({:s})" [label="{:s}"];\n'.format(prefixe, escape_str(arbre.get_data()))
+    for fils, chiffre in ((arbre.get_left_subtree(), '0'), (arbre.get_right_subtree(), '1')):
+        label, couleur = (chiffre, BLACK) if not fils.is_empty() else ('', background_color)
+        descr += toDotRec(fils, background_color, prefixe + chiffre) + lien.format(prefixe, prefixe + chiffre, couleur, label)
+    return descr
+
+NOEUD_DOT = re.compile(r'\t"N([^"]*)" \[(.*)\];')
+LIEN_DOT = re.compile(r'\t"N([^"]*)" -> "N([^"]*)" \[(.*)\];')
+
+def normaliseDot(dot):
+    '''
+    return the sorted node and link lines of a DOT description, node ids replaced by the paths from the root,
+    so that descriptions that only differ by their ids and the order of their lines are equal
+    '''
+    noeuds, liens, fils = {}, [], {}
+    for ligne in dot.split('*/')[-1].splitlines():
+        trouve = LIEN_DOT.fullmatch(ligne)
+        if trouve:
+            liens.append(trouve.groups())
+            fils.setdefault(trouve.group(1), []).append(trouve.group(2))
+        else:
+            trouve = NOEUD_DOT.fullmatch(ligne)
+            if trouve:
+                noeuds[trouve.group(1)] = trouve.group(2)
+    racine = (set(noeuds) - {enfant for parent, enfant, _ in liens}).pop()
+    chemins, pile = {racine: ''}, [racine]
+    while pile:
+        parent = pile.pop()
+        for chiffre, enfant in zip('01', fils.get(parent, [])):
+            chemins[enfant] = chemins[parent] + chiffre
+            pile.append(enfant)
+    return sorted([(chemins[n], attributs) for n, attributs in noeuds.items()] +
+                  [(chemins[p], chemins[e], attributs) for p, e, attributs in liens])
+
+
+def construit(cles):
+    abr = Abr()
+    for elt in cles:
+        abr = abr.insere(elt)
+    return abr
+
+def mesure(instruction, nombre):
+    '''
+    return the best mean time (in µs) of instruction over 5 repeats, or None if it raises RecursionError
+    '''
+    try:
+        return min(timeit.repeat(instruction, number=nombre, repeat=5)) / nombre * 1e6
+    except RecursionError:
+        return None
+
+def verifie(abr, cles):
+    '''
+    check that the iterative operations give the same results as the recursive ones,
+    return False if the recursive ones raise RecursionError
+    '''
+    try:
+        sondes = random.Random(0).sample(cles, min(20, len(cles))) + [min(cles) - 1, max(cles) + 1]
+        for elt in sondes:
+            assert strRec(abr.insere(elt)) == strRec(insereRec(abr, elt)), ("insere", elt)
+            assert abr.recherche(elt) == rechercheRec(abr, elt), ("recherche", elt)
+            assert strRec(abr.supprime(elt)) == strRec(supprimeRec(abr, elt)), ("supprime", elt)
+        assert abr.ordre_infixe() == ordreInfixeRec(abr)
+        assert str(abr) == strRec(abr)
+        assert normaliseDot(abr.to_dot()) == normaliseDot(toDotRec(abr))
+    except RecursionError:
+        return False
+    return True
+
+def compare(nom, abr, cles):
+    copie = construit(cles)
+    operations = [
+        ("insere", lambda: abr.insere(cles[0]), lambda: insereRec(abr, cles[0]), 200),
+        ("recherche", lambda: abr.recherche(cles[-1]), lambda: rechercheRec(abr, cles[-1]), 200),
+        ("supprime", lambda: abr.supprime(cles[-1]), lambda: supprimeRec(abr, cles[-1]), 200),
+        ("ordre_infixe", abr.ordre_infixe, lambda: ordreInfixeRec(abr), 5),
+        ("__eq__", lambda: abr == copie, lambda: egalRec(abr, copie), 5),
+        ("__str__", lambda: str(abr), lambda: strRec(abr), 5),
+        ("to_dot", abr.to_dot, lambda: toDotRec(abr), 5),
+    ]
+    print("{} tree (size {}, height {})".format(nom, abr.size(), abr.hauteur()))
+    print("Same results as the recursive versions:", "yes" if verifie(abr, cles) else "not checked (RecursionError)")
+    print("Operation\t|Iterative (µs)\t|Recursive (µs)")
+    for operation, iteratif, recursif, nombre in operations:
+        t_rec = mesure(recursif, nombre)
+        print("{}\t|{:0.2f}\t\t|{}".format(operation.ljust(12), mesure(iteratif, nombre),
+                                           "RecursionError" if t_rec is None else "{:0.2f}".format(t_rec)))
+    print()
+
+
+def main(taille):
+    cles = list(range(taille))
+    random.shuffle(cles)
+    compare("Random", construit(cles), cles)
+    cles = list(range(taille))
+    compare("Comb", construit(cles), cles)
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
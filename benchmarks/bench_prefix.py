@@ -0,0 +1,76 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+"""
+Aller-retour entre un arbre et sa forme préfixe "(a, (b, (), ()), ())" :
+sérialisation par str() puis relecture par BinaryTree.from_prefix, comparée
+à l'ancienne relecture qui redécoupait la chaîne à chaque niveau (O(n²)).
+
+usage : python benchmarks/bench_prefix.py [taille_max]
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from abr import Abr
+from binary_tree import BinaryTree
+
+
+def sousExpressions(expression):
+    '''
+    ancien découpage d'une expression en (tête, gauche, droite), par parcours de toute la chaîne
+    '''
+    res = []
+    cpt = 0
+    prev = 0
+    for i, c in enumerate(expression):
+        if c == "(":
+            cpt += 1
+        if c == ")":
+            cpt -= 1
+        if c == "," and cpt == 0:
+            res.append(expression[prev:i].strip("() "))
+            prev = i+1
+    res.append(expression[prev:].strip("() "))
+    return tuple(res)
+
+def fromPrefixRec(prefix, substitutions):
+    '''
+    ancienne version récursive de BinaryTree.from_prefix
+    '''
+    if "," not in prefix:
+        return substitutions[prefix]
+    d, left, right = sousExpressions(prefix.strip("() "))
+    return BinaryTree(substitutions[d], fromPrefixRec(left, substitutions), fromPrefixRec(right, substitutions))
+
+
+def chrono(f, *args):
+    debut = time.perf_counter()
+    res = f(*args)
+    return res, (time.perf_counter() - debut) * 1000
+
+
+def main(tailleMax):
+    print("Size\t|Length\t\t|str (ms)\t|from_prefix (ms)\t|old from_prefix (ms)")
+    taille = 10
+    while taille <= tailleMax:
+        cles = list(range(taille))
+        random.shuffle(cles)
+        arbre = Abr.from_iterable(cles)
+        substitutions = {str(k): k for k in cles}
+        substitutions[''] = BinaryTree()
+        texte, t_str = chrono(str, arbre)
+        relu, t_lecture = chrono(BinaryTree.from_prefix, texte, substitutions)
+        assert relu == arbre
+        if taille <= 10000:
+            t_ancien = "{:0.2f}".format(chrono(fromPrefixRec, texte, substitutions)[1])
+        else:
+            t_ancien = "-"
+        print("{}\t|{}\t\t|{:0.2f}\t\t|{:0.2f}\t\t\t|{}".format(taille, len(texte), t_str, t_lecture, t_ancien))
+        taille *= 10
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
@@ -0,0 +1,192 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+"""
+Banc d'essai des opérations d'Abr et de ses variantes équilibrées, sur
+plusieurs formes d'entrée et plusieurs tailles.
+
+Formes (ordre d'insertion des clés 0..n-1) :
+  aleatoire  permutation aléatoire (graine fixe)
+  peigne     clés triées : arbre filiforme
+  zigzag     0, n-1, 1, n-2... : arbre filiforme qui alterne gauche et droite
+  equilibre  médiane d'abord (parcours en largeur d'un arbre équilibré)
+
+Chaque opération est exécutée une fois à vide, puis mesurée sur plusieurs
+répétitions (minimum et médiane, en µs par opération) ; le pic mémoire de
+chaque opération est mesuré à part avec tracemalloc. Les résultats sont
+écrits en JSON, et deux fichiers de résultats se comparent avec --compare.
+
+usage : python benchmarks/bench_suite.py [--max-size N] [--engines abr avl] [--output res.json]
+        python benchmarks/bench_suite.py --compare avant.json apres.json [--threshold 0.1]
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+import timeit
+import tracemalloc
+from collections import deque
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from simulation import ENGINES
+
+DEGENERATE_MAX = 10**4 # au-delà, une seule opération sur un peigne coûte O(n) : tailles ignorées
+NB_SONDES = 100 # nombre de clés par mesure des opérations ponctuelles
+
+
+def aleatoire(taille):
+    cles = list(range(taille))
+    random.Random(taille).shuffle(cles)
+    return cles
+
+def peigne(taille):
+    return list(range(taille))
+
+def zigzag(taille):
+    cles = []
+    bas, haut = 0, taille - 1
+    while bas <= haut:
+        cles.append(bas)
+        if bas != haut:
+            cles.append(haut)
+        bas, haut = bas + 1, haut - 1
+    return cles
+
+def equilibre(taille):
+    cles = []
+    file = deque([(0, taille)])
+    while file:
+        debut, fin = file.popleft()
+        if debut < fin:
+            milieu = (debut + fin) // 2
+            cles.append(milieu)
+            file.append((debut, milieu))
+            file.append((milieu + 1, fin))
+    return cles
+
+SHAPES = {'aleatoire': aleatoire, 'peigne': peigne, 'zigzag': zigzag, 'equilibre': equilibre}
+DEGENERATE = ('peigne', 'zigzag')
+
+
+def operations(moteur, cles):
+    '''
+    return the list of (name, function, number of operations per call) to measure on the tree of the given keys
+    '''
+    arbre = moteur.from_iterable(cles)
+    copie = moteur.from_iterable(cles)
+    sondes = random.Random(0).sample(cles, min(NB_SONDES, len(cles)))
+    nouvelles = [elt + 0.5 for elt in sondes]
+    return [
+        ("from_iterable", lambda: moteur.from_iterable(cles), len(cles)),
+        ("insere", lambda: [arbre.insere(elt) for elt in nouvelles], len(nouvelles)),
+        ("recherche", lambda: [arbre.recherche(elt) for elt in sondes], len(sondes)),
+        ("supprime", lambda: [arbre.supprime(elt) for elt in sondes], len(sondes)),
+        ("ordre_infixe", arbre.ordre_infixe, 1),
+        ("est_abr", arbre.est_abr, 1),
+        ("est_abr_complet", arbre._est_abr_complet, 1),
+        ("__eq__", lambda: arbre == copie, 1),
+    ]
+
+def mesure(fonction, repetitions):
+    '''
+    return the couple (min, median) of the duration in seconds of fonction over repetitions calls, after one warm-up call
+    calls are grouped so that each timing lasts at least about 1 ms
+    '''
+    fonction()
+    nombre = 1
+    while nombre < 10**6 and timeit.timeit(fonction, number=nombre) < 1e-3:
+        nombre *= 10
+    durees = [duree / nombre for duree in timeit.repeat(fonction, number=nombre, repeat=repetitions)]
+    return min(durees), statistics.median(durees)
+
+def picMemoire(fonction):
+    '''
+    return the peak of memory (in KiB) allocated by one call of fonction
+    '''
+    tracemalloc.start()
+    try:
+        fonction()
+        return tracemalloc.get_traced_memory()[1] / 1024
+    finally:
+        tracemalloc.stop()
+
+def lance(moteurs, formes, tailles, repetitions):
+    '''
+    return the list of the result records of every (engine, shape, size, operation)
+    '''
+    resultats = []
+    for nom in moteurs:
+        for forme in formes:
+            for taille in tailles:
+                if forme in DEGENERATE and taille > DEGENERATE_MAX and nom == 'abr':
+                    continue
+                for operation, fonction, nombre in operations(ENGINES[nom], SHAPES[forme](taille)):
+                    t_min, t_med = mesure(fonction, repetitions)
+                    resultats.append({"engine": nom, "shape": forme, "size": taille, "operation": operation,
+                                      "min_us": t_min / nombre * 1e6, "median_us": t_med / nombre * 1e6,
+                                      "peak_kib": picMemoire(fonction)})
+                    print("{}\t|{}\t|{}\t|{}\t|{:0.3f}\t|{:0.3f}\t|{:0.1f}".format(
+                        nom, forme, taille, operation.ljust(15), resultats[-1]["min_us"],
+                        resultats[-1]["median_us"], resultats[-1]["peak_kib"]), flush=True)
+    return resultats
+
+def compare(avant, apres, seuil):
+    '''
+    print the ratio of the median times of the records common to both result files and return the number of regressions
+    '''
+    cle = lambda r: (r["engine"], r["shape"], r["size"], r["operation"])
+    anciens = {cle(r): r for r in avant["results"]}
+    regressions = 0
+    print("Engine\t|Shape\t\t|Size\t|Operation\t\t|Before (µs)\t|After (µs)\t|Ratio")
+    for r in apres["results"]:
+        if cle(r) not in anciens:
+            continue
+        ancien = anciens[cle(r)]["median_us"]
+        ratio = r["median_us"] / ancien if ancien else float('inf')
+        marque = ""
+        if ratio > 1 + seuil:
+            marque, regressions = "  <- slower", regressions + 1
+        elif ratio < 1 - seuil:
+            marque = "  <- faster"
+        print("{}\t|{}\t|{}\t|{}\t|{:0.3f}\t\t|{:0.3f}\t\t|{:0.2f}{}".format(
+            r["engine"], r["shape"].ljust(9), r["size"], r["operation"].ljust(15), ancien, r["median_us"], ratio, marque))
+    print("{} regression(s) above {:0.0f}%".format(regressions, seuil * 100))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark of the Abr engines")
+    parser.add_argument("--engines", nargs="+", default=["abr"], choices=[nom for nom in ENGINES if nom != 'compact'])
+    parser.add_argument("--shapes", nargs="+", default=list(SHAPES), choices=list(SHAPES))
+    parser.add_argument("--max-size", type=int, default=10**5, help="largest size (sizes are 10, 100, ... up to it)")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", help="JSON file where the results are written")
+    parser.add_argument("--compare", nargs=2, metavar=("BEFORE", "AFTER"), help="compare two JSON result files")
+    parser.add_argument("--threshold", type=float, default=0.1, help="relative change reported by --compare")
+    args = parser.parse_args()
+    if args.compare:
+        fichiers = []
+        for nom in args.compare:
+            with open(nom) as f:
+                fichiers.append(json.load(f))
+        sys.exit(1 if compare(fichiers[0], fichiers[1], args.threshold) else 0)
+    tailles = []
+    taille = 10
+    while taille <= args.max_size:
+        tailles.append(taille)
+        taille *= 10
+    print("Engine\t|Shape\t|Size\t|Operation\t\t|Min (µs/op)\t|Median (µs/op)\t|Peak (KiB)")
+    resultats = lance(args.engines, args.shapes, tailles, args.repeat)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"meta": {"date": time.strftime("%Y-%m-%dT%H:%M:%S"), "python": platform.python_version(),
+                                "platform": platform.platform(), "repeat": args.repeat},
+                       "results": resultats}, f, indent=1)
+
+
+if __name__ == '__main__':
+    main()
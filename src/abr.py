@@ -1,5 +1,6 @@
 #!/usr/bin/python3
 # -*- coding: utf-8 -*-
+from bisect import bisect_left, bisect_right
 from binary_tree import BinaryTree
 from binary_tree import BinaryTreeError
 
@@ -27,83 +28,578 @@ class Abr(BinaryTree):
     >>> a = a.supprime(3)
     >>> a == Abr(2, Abr(), Abr())
     True
+
+    Les opérations de mise à jour passent par le constructeur de confiance
+    :meth:`_noeud`, qui ne vérifie que l'ordre local. Le mode paranoïaque
+    rétablit la validation complète des sous-arbres à chaque construction :
+
+    >>> Abr.paranoiaque = True
+    >>> Abr().insere(2).insere(1) == Abr(2, Abr(1, Abr(), Abr()), Abr())
+    True
+    >>> Abr.paranoiaque = False
     """
+    paranoiaque = False
+    # métadonnées de l'arbre vide, surchargées sur chaque nœud par _set_content
+    _min = None
+    _max = None
+    _ordonne = True
+
     def __init__(self, *args):
+        if (len(args) == 3 and all(isinstance(st, BinaryTree) for st in args[1:]) and
+                not all(isinstance(st, Abr) for st in args[1:])):
+            raise AbrError('type non conforme')
         super().__init__(*args)
         if len(args) > 0:
             rac, sag, sad = args
-            if not isinstance(sag, Abr) or not isinstance(sad, Abr):
-                raise AbrError('type non conforme')
-            if not sag.est_abr() or not sad.est_abr():
+            valide = Abr._est_abr_complet if self.paranoiaque else Abr.est_abr
+            if not valide(sag) or not valide(sad):
                 raise AbrError('données non conformes')
-        
+
+    def _set_content(self, rac, sag, sad):
+        """
+        Calcule en plus le minimum, le maximum et la propriété d'ABR du nœud
+        à partir de ceux des sous-arbres, en O(1).
+        """
+        super()._set_content(rac, sag, sad)
+        self._min = rac if sag.is_empty() else sag._min
+        self._max = rac if sad.is_empty() else sad._max
+        self._ordonne = (sag._ordonne and sad._ordonne and
+                         (sag.is_empty() or sag._max <= rac) and
+                         (sad.is_empty() or sad._min >= rac))
+
+    @classmethod
+    def _noeud(cls, rac, sag, sad):
+        """
+        Constructeur de confiance utilisé par les opérations internes.
+
+        Les sous-arbres sag et sad sont supposés être déjà des ABR : seul
+        l'ordre local entre la racine, le maximum du sous-arbre gauche et le
+        minimum du sous-arbre droit est vérifié, en O(1). Si l'attribut de
+        classe `paranoiaque` est vrai, la validation complète du constructeur
+        public est effectuée. En mode hash-consing, un nœud identique encore
+        vivant est réutilisé.
+
+        :param rac: (any) la racine
+        :param sag: (Abr) le sous-arbre gauche
+        :param sad: (Abr) le sous-arbre droit
+        :return: (Abr) un nouvel arbre (rac, sag, sad)
+        """
+        if cls.paranoiaque:
+            arbre = cls(rac, sag, sad)
+        elif cls.hash_consing:
+            arbre = cls._lookup_interned(rac, sag, sad)
+            if arbre is None:
+                arbre = object.__new__(cls)
+                arbre._set_content(rac, sag, sad)
+                arbre._intern()
+        else:
+            arbre = object.__new__(cls)
+            arbre._set_content(rac, sag, sad)
+        if not arbre._ordonne:
+            raise AbrError('données non conformes')
+        return arbre
+
+    @classmethod
+    def _node(cls, rac, sag, sad):
+        return cls._noeud(rac, sag, sad)
+
+    @classmethod
+    def from_sorted(cls, cles):
+        """
+        Construit en O(n) un ABR équilibré à partir de clés triées.
+
+        :param cles: (iterable) des clés en ordre croissant
+        :return: (Abr) un arbre de hauteur minimale contenant ces clés
+        :raise AbrError: si les clés ne sont pas triées
+
+        >>> Abr.from_sorted(range(1, 8)).hauteur()
+        3
+        >>> Abr.from_sorted([1, 2, 3]) == Abr(2, Abr(1, Abr(), Abr()), Abr(3, Abr(), Abr()))
+        True
+        """
+        cles = list(cles)
+        vide = cls()
+        arbres = []
+        # chaque intervalle [debut, fin[ est empilé deux fois : pour construire
+        # ses deux moitiés, puis pour les réunir sous la clé du milieu
+        pile = [(0, len(cles), False)]
+        while pile:
+            debut, fin, moities_construites = pile.pop()
+            milieu = (debut + fin) // 2
+            if debut >= fin:
+                arbres.append(vide)
+            elif moities_construites:
+                sad = arbres.pop()
+                sag = arbres.pop()
+                arbres.append(cls._noeud(cles[milieu], sag, sad))
+            else:
+                pile.append((debut, fin, True))
+                pile.append((milieu + 1, fin, False))
+                pile.append((debut, milieu, False))
+        return arbres[0]
+
+    @classmethod
+    def from_iterable(cls, cles):
+        """
+        Construit en O(n log n) l'arbre obtenu en insérant les clés une à une
+        dans l'ordre, sans recopier de chemin.
+
+        L'arbre d'insertion est l'arbre cartésien des clés (ordre infixe) et
+        de leurs rangs d'insertion (ordre de tas) : il se construit avec une
+        pile contenant sa branche droite, après un tri des clés.
+
+        :param cles: (iterable) des clés dans leur ordre d'insertion
+        :return: (Abr) l'arbre égal à Abr().insere(c1).insere(c2)...
+
+        >>> cles = [3, 1, 4, 1, 5, 9, 2, 6]
+        >>> a = Abr()
+        >>> for c in cles:
+        ...     a = a.insere(c)
+        >>> Abr.from_iterable(cles) == a
+        True
+        """
+        cles = list(cles)
+        n = len(cles)
+        gauche = [-1] * n
+        droite = [-1] * n
+        branche_droite = []
+        # à clé égale, la dernière insérée descend à gauche des précédentes
+        for i in sorted(range(n), key=lambda i: (cles[i], -i)):
+            dernier = -1
+            while branche_droite and branche_droite[-1] > i:
+                dernier = branche_droite.pop()
+            gauche[i] = dernier
+            if branche_droite:
+                droite[branche_droite[-1]] = i
+            branche_droite.append(i)
+        # un nœud est inséré avant ses descendants : on construit donc les
+        # nœuds du dernier inséré au premier
+        vide = cls()
+        arbres = [vide] * (n + 1) # arbres[-1] : l'arbre vide
+        for i in range(n - 1, -1, -1):
+            arbres[i] = cls._noeud(cles[i], arbres[gauche[i]], arbres[droite[i]])
+        return arbres[0]
+
     def ordre_infixe(self):
-        return (self.get_left_subtree().ordre_infixe() + 
-                [self.get_data()] + 
-                self.get_right_subtree().ordre_infixe())
+        return list(self.iter_in_order())
+
+    def iter_range(self, lo, hi):
+        """
+        Parcourt dans l'ordre croissant les clés comprises entre lo et hi
+        (inclus), sans descendre dans les sous-arbres hors de ces bornes.
+
+        :param lo: (any) la borne inférieure
+        :param hi: (any) la borne supérieure
+        :return: (generator) les clés c telles que lo <= c <= hi
+
+        >>> list(Abr.from_iterable([5, 2, 8, 1, 6, 9, 3]).iter_range(3, 8))
+        [3, 5, 6, 8]
+        """
+        pile = []
+        arbre = self
+        while True:
+            while not arbre.is_empty():
+                if arbre.get_data() < lo:
+                    # le nœud et son sous-arbre gauche sont sous la borne
+                    arbre = arbre.get_right_subtree()
+                else:
+                    pile.append(arbre)
+                    arbre = arbre.get_left_subtree()
+            if not pile:
+                return
+            arbre = pile.pop()
+            if arbre.get_data() > hi:
+                # toutes les clés restantes sont au-dessus de la borne
+                return
+            yield arbre.get_data()
+            arbre = arbre.get_right_subtree()
     
     def est_abr(self):
-        #liste_infixe = ordre_infixe()
-        #return all(liste_infixe[i] <= liste_infixe[i+1] for i in range(len(liste_infixe) - 1))
-        if self.is_empty():
-            return True
-        else:
-            return (self.get_left_subtree().est_abr() and
-                    self.get_right_subtree().est_abr() and
-                    (self.get_left_subtree().is_empty() or self.get_left_subtree().maximum() <= self.get_data()) and
-                    (self.get_right_subtree().is_empty() or self.get_right_subtree().minimum() >= self.get_data()))
+        return self._ordonne
+
+    def _est_abr_complet(self):
+        """
+        Vérification complète, sans utiliser les métadonnées des nœuds :
+        le parcours infixe doit être croissant. Utilisée en mode paranoïaque.
+        """
+        cles = self.iter_in_order()
+        precedente = next(cles, None)
+        for cle in cles:
+            if not precedente <= cle:
+                return False
+            precedente = cle
+        return True
     
+    def _recolle(self, chemin, sous_arbre):
+        """
+        Recopie un chemin de la racine vers sous_arbre, du bas vers le haut.
+
+        :param chemin: (list) couples (nœud, à_gauche) de la racine au parent de sous_arbre,
+                       à_gauche indiquant la branche suivie depuis ce nœud
+        :param sous_arbre: (Abr) le nouveau sous-arbre au bout du chemin
+        :return: (Abr) la nouvelle racine, qui partage tous les sous-arbres hors du chemin
+        """
+        for noeud, a_gauche in reversed(chemin):
+            if a_gauche:
+                sous_arbre = self._reconstruit(noeud, noeud.get_data(), sous_arbre, noeud.get_right_subtree())
+            else:
+                sous_arbre = self._reconstruit(noeud, noeud.get_data(), noeud.get_left_subtree(), sous_arbre)
+        return sous_arbre
+
+    def _reconstruit(self, noeud, rac, sag, sad):
+        """
+        Recopie le nœud noeud avec la racine rac et les sous-arbres sag et sad.
+        Point d'extension des arbres équilibrés, qui y rééquilibrent l'arbre
+        à chaque niveau d'un chemin recopié.
+
+        :param noeud: (Abr) le nœud recopié
+        :return: (Abr) le nouveau nœud
+        """
+        return self._noeud(rac, sag, sad)
+
     def insere(self, elt):
-        if self.is_empty():
-            return Abr(elt, Abr(), Abr())
-        elif elt <= self.get_data():
-            return Abr(self.get_data(), self.get_left_subtree().insere(elt), self.get_right_subtree())
-        elif elt > self.get_data():
-            return Abr(self.get_data(), self.get_left_subtree(), self.get_right_subtree().insere(elt))
+        chemin = []
+        arbre = self
+        while not arbre.is_empty():
+            a_gauche = elt <= arbre.get_data()
+            chemin.append((arbre, a_gauche))
+            arbre = arbre.get_left_subtree() if a_gauche else arbre.get_right_subtree()
+        return self._recolle(chemin, self._noeud(elt, arbre, arbre))
     
     def recherche(self, elt):
-        if self.is_empty():
-            return False
-        elif elt == self.get_data():
-            return True
-        elif elt <= self.get_data():
-            return self.get_left_subtree().recherche(elt)
-        else:
-            return self.get_right_subtree().recherche(elt)
+        arbre = self
+        while not arbre.is_empty():
+            rac = arbre.get_data()
+            if elt == rac:
+                return True
+            elif elt <= rac:
+                arbre = arbre.get_left_subtree()
+            else:
+                arbre = arbre.get_right_subtree()
+        return False
     
     def minimum(self):
-        sag = self.get_left_subtree()
-        if sag.is_empty():
-            return self.get_data()
-        else:
-            return sag.minimum()
+        if self.is_empty():
+            raise AbrError("l'arbre vide n'a pas de minimum")
+        return self._min
     
     def maximum(self):
-        sad = self.get_right_subtree()
-        if sad.is_empty():
-            return self.get_data()
-        else:
-            return sad.maximum()
+        if self.is_empty():
+            raise AbrError("l'arbre vide n'a pas de maximum")
+        return self._max
+
+    def _extrait_maximum(self):
+        """
+        Retire le maximum comme la suppression récursive d'origine : le nœud
+        du maximum, s'il a un sous-arbre gauche, n'est pas décroché mais prend
+        à son tour le maximum de ce sous-arbre, et ainsi de suite.
+
+        :return: (tuple) le couple (maximum, arbre privé de ce maximum)
+        :CU: l'arbre n'est pas vide
+        """
+        # étapes : (maximum, chemin vers le premier nœud qui le porte, ce nœud)
+        etapes = []
+        arbre = self
+        while True:
+            elt_max = arbre.maximum()
+            chemin = []
+            while elt_max > arbre.get_data():
+                chemin.append((arbre, False))
+                arbre = arbre.get_right_subtree()
+            etapes.append((elt_max, chemin, arbre))
+            if arbre.get_left_subtree().is_empty():
+                break
+            arbre = arbre.get_left_subtree()
+        sous_arbre = None
+        for elt_max, chemin, noeud in reversed(etapes):
+            if sous_arbre is None:
+                remplacant = noeud.get_right_subtree()
+            else:
+                remplacant = self._reconstruit(noeud, max_suivant, sous_arbre, noeud.get_right_subtree())
+            sous_arbre, max_suivant = self._recolle(chemin, remplacant), elt_max
+        return max_suivant, sous_arbre
         
     def supprime(self, elt):
-        if self.is_empty():
-            return Abr()
-        else:
-            if elt < self.get_data():
-                return Abr(self.get_data(), self.get_left_subtree().supprime(elt), self.get_right_subtree())
-            elif elt > self.get_data():
-                return Abr(self.get_data(), self.get_left_subtree(), self.get_right_subtree().supprime(elt))
+        """
+        Supprime une occurrence de elt ; une racine qui a un sous-arbre gauche
+        est remplacée par le maximum de celui-ci (voir _extrait_maximum).
+
+        >>> print(Abr.from_iterable([10, 5, 3, 4]).supprime(10))
+        (5, (4, (3, (), ()), ()), ())
+        """
+        chemin = []
+        arbre = self
+        while not arbre.is_empty():
+            rac = arbre.get_data()
+            if elt < rac:
+                chemin.append((arbre, True))
+                arbre = arbre.get_left_subtree()
+            elif elt > rac:
+                chemin.append((arbre, False))
+                arbre = arbre.get_right_subtree()
             else: # elt == rac
-                if self.get_left_subtree().is_empty():
-                    return self.get_right_subtree()
-                else:
-                    elt_max = self.get_left_subtree().maximum()
-                    return Abr(elt_max, self.get_left_subtree().supprime(elt_max), self.get_right_subtree())
+                break
+        if arbre.is_empty():
+            return self
+        if arbre.get_left_subtree().is_empty():
+            remplacant = arbre.get_right_subtree()
+        else:
+            elt_max, sag = arbre.get_left_subtree()._extrait_maximum()
+            remplacant = self._reconstruit(arbre, elt_max, sag, arbre.get_right_subtree())
+        return self._recolle(chemin, remplacant)
     
-    def hauteur(self):
-        if self.is_empty():
+    def insert_many(self, cles):
+        """
+        Insère toutes les clés du lot en une seule passe : le lot trié est
+        réparti entre les sous-arbres selon leur racine, seuls les nœuds
+        qui reçoivent des clés sont recopiés, et les clés qui arrivent sur
+        un arbre vide y forment un sous-arbre équilibré.
+
+        :param cles: (iterable) les clés à insérer
+        :return: (Abr) un nouvel arbre contenant en plus toutes ces clés
+
+        >>> a = Abr.from_iterable([5, 2, 8, 6])
+        >>> b = a.insert_many([3, 1, 4])
+        >>> b.ordre_infixe()
+        [1, 2, 3, 4, 5, 6, 8]
+        >>> b.get_right_subtree() is a.get_right_subtree()
+        True
+        """
+        lot = sorted(cles)
+        arbres = []
+        # (arbre, début, fin, visité) : arbre reçoit les clés lot[début:fin] ;
+        # à la seconde visite, ses deux sous-arbres sont au sommet de arbres
+        pile = [(self, 0, len(lot), False)]
+        while pile:
+            arbre, debut, fin, visite = pile.pop()
+            if visite:
+                sad = arbres.pop()
+                sag = arbres.pop()
+                if sag is arbre.get_left_subtree() and sad is arbre.get_right_subtree():
+                    arbres.append(arbre)
+                else:
+                    arbres.append(self._noeud(arbre.get_data(), sag, sad))
+            elif debut == fin:
+                arbres.append(arbre)
+            elif fin - debut == 1 and arbre.is_empty():
+                arbres.append(self._noeud(lot[debut], arbre, arbre))
+            elif arbre.is_empty():
+                arbres.append(type(self).from_sorted(lot[debut:fin]))
+            else:
+                milieu = bisect_right(lot, arbre.get_data(), debut, fin)
+                pile.append((arbre, debut, fin, True))
+                pile.append((arbre.get_right_subtree(), milieu, fin, False))
+                pile.append((arbre.get_left_subtree(), debut, milieu, False))
+        return arbres[0]
+
+    def delete_many(self, cles):
+        """
+        Supprime une occurrence de chaque clé du lot en une seule passe, en
+        recopiant seulement les nœuds dont un sous-arbre perd des clés.
+
+        :param cles: (iterable) les clés à supprimer (absentes : ignorées)
+        :return: (Abr) un nouvel arbre privé de ces clés
+
+        >>> a = Abr.from_iterable([5, 2, 8, 6, 9, 2])
+        >>> b = a.delete_many([2, 8, 7])
+        >>> b.ordre_infixe()
+        [2, 5, 6, 9]
+        >>> a.delete_many([9, 6]).get_left_subtree() is a.get_left_subtree()
+        True
+        """
+        lot = sorted(cles)
+        arbres = []
+        # à la seconde visite d'un nœud, lot[début:fin] contient les clés égales à sa racine
+        pile = [(self, 0, len(lot), False)]
+        while pile:
+            arbre, debut, fin, visite = pile.pop()
+            if visite:
+                sad = arbres.pop()
+                sag = arbres.pop()
+                if debut < fin:
+                    if sag.is_empty():
+                        nouveau = sad
+                    else:
+                        elt_max, sag = sag._extrait_maximum()
+                        nouveau = self._noeud(elt_max, sag, sad)
+                    for _ in range(fin - debut - 1):
+                        nouveau = nouveau.supprime(arbre.get_data())
+                    arbres.append(nouveau)
+                elif sag is arbre.get_left_subtree() and sad is arbre.get_right_subtree():
+                    arbres.append(arbre)
+                else:
+                    arbres.append(self._noeud(arbre.get_data(), sag, sad))
+            elif debut == fin or arbre.is_empty():
+                arbres.append(arbre)
+            else:
+                rac = arbre.get_data()
+                debut_egaux = bisect_left(lot, rac, debut, fin)
+                fin_egaux = bisect_right(lot, rac, debut_egaux, fin)
+                pile.append((arbre, debut_egaux, fin_egaux, True))
+                pile.append((arbre.get_right_subtree(), fin_egaux, fin, False))
+                pile.append((arbre.get_left_subtree(), debut, debut_egaux, False))
+        return arbres[0]
+
+    def search_many(self, sondes):
+        """
+        Recherche toutes les clés sondes en un seul parcours de l'arbre : les
+        sondes triées sont réparties entre les sous-arbres, et chaque nœud
+        n'est visité qu'une fois.
+
+        :param sondes: (iterable) les clés recherchées
+        :return: (list) pour chaque sonde, dans l'ordre, True si elle est dans l'arbre
+
+        >>> Abr.from_iterable([5, 2, 8]).search_many([8, 3, 5, 5])
+        [True, False, True, True]
+        """
+        sondes = list(sondes)
+        ordre = sorted(range(len(sondes)), key=sondes.__getitem__)
+        valeurs = [sondes[i] for i in ordre]
+        res = [False] * len(sondes)
+        pile = [(self, 0, len(valeurs))]
+        while pile:
+            arbre, debut, fin = pile.pop()
+            if debut == fin or arbre.is_empty():
+                continue
+            rac = arbre.get_data()
+            debut_egaux = bisect_left(valeurs, rac, debut, fin)
+            fin_egaux = bisect_right(valeurs, rac, debut_egaux, fin)
+            for k in range(debut_egaux, fin_egaux):
+                res[ordre[k]] = True
+            pile.append((arbre.get_right_subtree(), fin_egaux, fin))
+            pile.append((arbre.get_left_subtree(), debut, debut_egaux))
+        return res
+
+    def select(self, k):
+        """
+        :param k: (int) un rang, de 0 à taille - 1
+        :return: (any) la k-ième plus petite clé (select(0) est le minimum)
+        :raise AbrError: si k est hors de l'arbre
+
+        >>> Abr.from_iterable([5, 2, 8, 1, 6]).select(3)
+        6
+        """
+        if not 0 <= k < self._size:
+            raise AbrError('rang hors de l\'arbre')
+        arbre = self
+        while True:
+            taille_gauche = arbre.get_left_subtree()._size
+            if k < taille_gauche:
+                arbre = arbre.get_left_subtree()
+            elif k == taille_gauche:
+                return arbre.get_data()
+            else:
+                k -= taille_gauche + 1
+                arbre = arbre.get_right_subtree()
+
+    def _compte_inferieurs(self, elt, strict):
+        """
+        :return: (int) le nombre de clés < elt si strict, <= elt sinon
+        """
+        compte = 0
+        arbre = self
+        while not arbre.is_empty():
+            rac = arbre.get_data()
+            if rac < elt or (not strict and rac == elt):
+                compte += arbre.get_left_subtree()._size + 1
+                arbre = arbre.get_right_subtree()
+            else:
+                arbre = arbre.get_left_subtree()
+        return compte
+
+    def rank(self, elt):
+        """
+        :return: (int) le nombre de clés strictement inférieures à elt,
+                 c'est-à-dire le rang de elt s'il est dans l'arbre
+
+        >>> a = Abr.from_iterable([5, 2, 8, 1, 6])
+        >>> a.rank(6), a.select(a.rank(6)), a.rank(7)
+        (3, 6, 4)
+        """
+        return self._compte_inferieurs(elt, True)
+
+    def count_range(self, lo, hi):
+        """
+        :return: (int) le nombre de clés c telles que lo <= c <= hi
+
+        >>> Abr.from_iterable([5, 2, 8, 1, 6, 5]).count_range(2, 6)
+        4
+        """
+        if hi < lo:
             return 0
-        else:
-            left_depth = self.get_left_subtree().hauteur() if self.get_left_subtree() else 0
-            right_depth = self.get_right_subtree().hauteur() if self.get_right_subtree() else 0
-            return max(left_depth, right_depth) + 1
+        return self._compte_inferieurs(hi, False) - self._compte_inferieurs(lo, True)
+
+    def floor(self, elt):
+        """
+        :return: (any) la plus grande clé <= elt, None s'il n'y en a pas
+
+        >>> a = Abr.from_iterable([5, 2, 8])
+        >>> a.floor(7), a.floor(5), a.floor(1)
+        (5, 5, None)
+        """
+        res = None
+        arbre = self
+        while not arbre.is_empty():
+            if arbre.get_data() <= elt:
+                res = arbre.get_data()
+                arbre = arbre.get_right_subtree()
+            else:
+                arbre = arbre.get_left_subtree()
+        return res
+
+    def ceiling(self, elt):
+        """
+        :return: (any) la plus petite clé >= elt, None s'il n'y en a pas
+
+        >>> a = Abr.from_iterable([5, 2, 8])
+        >>> a.ceiling(3), a.ceiling(5), a.ceiling(9)
+        (5, 5, None)
+        """
+        res = None
+        arbre = self
+        while not arbre.is_empty():
+            if arbre.get_data() >= elt:
+                res = arbre.get_data()
+                arbre = arbre.get_left_subtree()
+            else:
+                arbre = arbre.get_right_subtree()
+        return res
+
+    def successor(self, elt):
+        """
+        :return: (any) la plus petite clé > elt, None s'il n'y en a pas
+
+        >>> a = Abr.from_iterable([5, 2, 8])
+        >>> a.successor(5), a.successor(8)
+        (8, None)
+        """
+        res = None
+        arbre = self
+        while not arbre.is_empty():
+            if arbre.get_data() > elt:
+                res = arbre.get_data()
+                arbre = arbre.get_left_subtree()
+            else:
+                arbre = arbre.get_right_subtree()
+        return res
+
+    def predecessor(self, elt):
+        """
+        :return: (any) la plus grande clé < elt, None s'il n'y en a pas
+
+        >>> a = Abr.from_iterable([5, 2, 8])
+        >>> a.predecessor(5), a.predecessor(2)
+        (2, None)
+        """
+        res = None
+        arbre = self
+        while not arbre.is_empty():
+            if arbre.get_data() < elt:
+                res = arbre.get_data()
+                arbre = arbre.get_right_subtree()
+            else:
+                arbre = arbre.get_left_subtree()
+        return res
+
+    def hauteur(self):
+        return self._height + 1
@@ -0,0 +1,208 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+from array import array
+
+VIDE = -1  # sentinelle partagée : indice de l'arbre vide
+
+
+class AbrCompactError(Exception):
+    def __init__(self, msg):
+        self.message = msg
+
+
+class AbrCompact():
+    """
+    Arbre binaire de recherche compact, stocké dans trois tableaux parallèles
+    (clé, indice du fils gauche, indice du fils droit). Un nœud coûte 16 octets
+    au lieu d'un objet Python, d'un triplet et de deux arbres vides.
+
+    L'interface reprend celle d'Abr (insere, recherche, supprime, hauteur,
+    ordre_infixe), mais l'arbre est modifié en place : insere et supprime
+    renvoient l'arbre lui-même, si bien que `a = a.insere(x)` reste valable.
+
+    :Exemples:
+
+    >>> a = AbrCompact()
+    >>> a = a.insere(2)
+    >>> a = a.insere(3)
+    >>> a = a.insere(1)
+    >>> a.ordre_infixe()
+    [1, 2, 3]
+    >>> a.hauteur()
+    2
+    >>> a.recherche(4)
+    False
+    >>> a.recherche(3)
+    True
+    >>> a = a.supprime(2)
+    >>> a.ordre_infixe()
+    [1, 3]
+    >>> a.hauteur()
+    2
+    """
+    def __init__(self, typecode='q'):
+        """
+        :param typecode: (str) code de type du tableau des clés ('q' pour des entiers, 'd' pour des flottants)
+        """
+        self._cles = array(typecode)
+        self._gauche = array('i')
+        self._droite = array('i')
+        self._libres = array('i')
+        self._racine = VIDE
+        self._taille = 0
+        self._hauteur = 0  # None si elle doit être recalculée après une suppression
+
+    @classmethod
+    def from_iterable(cls, cles, typecode='q'):
+        """
+        :param cles: (iterable) des clés dans leur ordre d'insertion
+        :return: (AbrCompact) l'arbre obtenu en insérant les clés une à une
+        """
+        arbre = cls(typecode)
+        for elt in cles:
+            arbre.insere(elt)
+        return arbre
+
+    def is_empty(self):
+        return self._racine == VIDE
+
+    def size(self):
+        return self._taille
+
+    def _alloue(self, elt):
+        """
+        Renvoie l'indice d'un nouveau nœud feuille de clé elt, en réutilisant
+        si possible un emplacement libéré par supprime.
+        """
+        if self._libres:
+            i = self._libres.pop()
+            self._cles[i] = elt
+            self._gauche[i] = VIDE
+            self._droite[i] = VIDE
+        else:
+            i = len(self._cles)
+            self._cles.append(elt)
+            self._gauche.append(VIDE)
+            self._droite.append(VIDE)
+        return i
+
+    def insere(self, elt):
+        cles, gauche, droite = self._cles, self._gauche, self._droite
+        nouveau = self._alloue(elt)
+        profondeur = 1
+        if self._racine == VIDE:
+            self._racine = nouveau
+        else:
+            i = self._racine
+            while True:
+                profondeur += 1
+                if elt <= cles[i]:
+                    if gauche[i] == VIDE:
+                        gauche[i] = nouveau
+                        break
+                    i = gauche[i]
+                else:
+                    if droite[i] == VIDE:
+                        droite[i] = nouveau
+                        break
+                    i = droite[i]
+        self._taille += 1
+        if self._hauteur is not None and profondeur > self._hauteur:
+            self._hauteur = profondeur
+        return self
+
+    def recherche(self, elt):
+        cles, gauche, droite = self._cles, self._gauche, self._droite
+        i = self._racine
+        while i != VIDE:
+            if elt == cles[i]:
+                return True
+            elif elt <= cles[i]:
+                i = gauche[i]
+            else:
+                i = droite[i]
+        return False
+
+    def minimum(self):
+        if self._racine == VIDE:
+            raise AbrCompactError("l'arbre vide n'a pas de minimum")
+        i = self._racine
+        while self._gauche[i] != VIDE:
+            i = self._gauche[i]
+        return self._cles[i]
+
+    def maximum(self):
+        if self._racine == VIDE:
+            raise AbrCompactError("l'arbre vide n'a pas de maximum")
+        i = self._racine
+        while self._droite[i] != VIDE:
+            i = self._droite[i]
+        return self._cles[i]
+
+    def _remplace(self, parent, cote_gauche, i):
+        """
+        Accroche le sous-arbre d'indice i à la place du fils de parent.
+        """
+        if parent == VIDE:
+            self._racine = i
+        elif cote_gauche:
+            self._gauche[parent] = i
+        else:
+            self._droite[parent] = i
+
+    def supprime(self, elt):
+        cles, gauche, droite = self._cles, self._gauche, self._droite
+        parent, cote_gauche = VIDE, False
+        i = self._racine
+        while i != VIDE and elt != cles[i]:
+            parent, cote_gauche = i, elt < cles[i]
+            i = gauche[i] if cote_gauche else droite[i]
+        if i == VIDE:
+            return self
+        if gauche[i] == VIDE:
+            self._remplace(parent, cote_gauche, droite[i])
+            self._libres.append(i)
+        else:
+            # la clé est remplacée par le maximum du sous-arbre gauche,
+            # dont le nœud est décroché à la place
+            parent_max, j = i, gauche[i]
+            while droite[j] != VIDE:
+                parent_max, j = j, droite[j]
+            cles[i] = cles[j]
+            if parent_max == i:
+                gauche[i] = gauche[j]
+            else:
+                droite[parent_max] = gauche[j]
+            self._libres.append(j)
+        self._taille -= 1
+        self._hauteur = None
+        return self
+
+    def hauteur(self):
+        if self._hauteur is None:
+            hauteur = 0
+            pile = [(self._racine, 1)] if self._racine != VIDE else []
+            while pile:
+                i, profondeur = pile.pop()
+                if profondeur > hauteur:
+                    hauteur = profondeur
+                if self._gauche[i] != VIDE:
+                    pile.append((self._gauche[i], profondeur + 1))
+                if self._droite[i] != VIDE:
+                    pile.append((self._droite[i], profondeur + 1))
+            self._hauteur = hauteur
+        return self._hauteur
+
+    def ordre_infixe(self):
+        cles, gauche, droite = self._cles, self._gauche, self._droite
+        res = []
+        pile = []
+        i = self._racine
+        while pile or i != VIDE:
+            while i != VIDE:
+                pile.append(i)
+                i = gauche[i]
+            i = pile.pop()
+            res.append(cles[i])
+            i = droite[i]
+        return res
@@ -0,0 +1,274 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+import random
+from abr import Abr
+
+
+class _AbrEquilibre(Abr):
+    """
+    Base des ABR équilibrés : mêmes opérations persistantes qu'Abr, mais la
+    forme de l'arbre ne dépend plus seulement de l'ordre d'insertion, donc
+    les constructions et mises à jour en bloc procèdent élément par élément.
+    """
+    @classmethod
+    def from_iterable(cls, cles):
+        arbre = cls()
+        for elt in cles:
+            arbre = arbre.insere(elt)
+        return arbre
+
+    @classmethod
+    def from_sorted(cls, cles):
+        return cls.from_iterable(cles)
+
+    @classmethod
+    def load_binary(cls, filename):
+        """
+        Le format binaire ne conserve ni les couleurs ni les priorités : les
+        clés du fichier sont réinsérées dans l'ordre préfixe, ce qui redonne
+        un arbre équilibré, pas forcément de la même forme.
+        """
+        return cls.from_iterable(Abr.load_binary(filename).iter_pre_order())
+
+    def insert_many(self, cles):
+        arbre = self
+        for elt in cles:
+            arbre = arbre.insere(elt)
+        return arbre
+
+    def delete_many(self, cles):
+        arbre = self
+        for elt in cles:
+            arbre = arbre.supprime(elt)
+        return arbre
+
+
+class AbrAvl(_AbrEquilibre):
+    """
+    Arbre AVL : en chaque nœud, les hauteurs des deux sous-arbres diffèrent
+    d'au plus 1. L'insertion et la suppression d'Abr sont reprises telles
+    quelles ; chaque nœud du chemin recopié est rééquilibré par rotation.
+
+    :Exemples:
+
+    >>> a = AbrAvl.from_iterable(range(1000))
+    >>> a.hauteur()
+    10
+    >>> a.recherche(500)
+    True
+    >>> a = a.supprime(500)
+    >>> a.recherche(500), a.est_abr()
+    (False, True)
+    """
+    def _reconstruit(self, noeud, rac, sag, sad):
+        return self._equilibre(rac, sag, sad)
+
+    @classmethod
+    def _equilibre(cls, rac, sag, sad):
+        """
+        :return: (AbrAvl) l'arbre (rac, sag, sad), rééquilibré par une rotation
+                 simple ou double si les hauteurs de sag et sad diffèrent de 2
+        """
+        if sag._height > sad._height + 1:
+            g, d = sag.get_left_subtree(), sag.get_right_subtree()
+            if g._height >= d._height:
+                return cls._noeud(sag.get_data(), g, cls._noeud(rac, d, sad))
+            return cls._noeud(d.get_data(),
+                              cls._noeud(sag.get_data(), g, d.get_left_subtree()),
+                              cls._noeud(rac, d.get_right_subtree(), sad))
+        if sad._height > sag._height + 1:
+            g, d = sad.get_left_subtree(), sad.get_right_subtree()
+            if d._height >= g._height:
+                return cls._noeud(sad.get_data(), cls._noeud(rac, sag, g), d)
+            return cls._noeud(g.get_data(),
+                              cls._noeud(rac, sag, g.get_left_subtree()),
+                              cls._noeud(sad.get_data(), g.get_right_subtree(), d))
+        return cls._noeud(rac, sag, sad)
+
+
+class AbrRougeNoir(_AbrEquilibre):
+    """
+    Arbre rouge-noir : la racine est noire, un nœud rouge n'a pas de fils
+    rouge et tous les chemins vers l'arbre vide comptent autant de nœuds
+    noirs. L'insertion suit l'équilibrage d'Okasaki sur le chemin recopié ;
+    la suppression répare le déficit de nœuds noirs en remontant le chemin.
+
+    :Exemples:
+
+    >>> a = AbrRougeNoir.from_iterable(range(1000))
+    >>> a.hauteur() <= 2 * 10
+    True
+    >>> a = a.supprime(0).supprime(999)
+    >>> a.minimum(), a.maximum(), a.est_abr()
+    (1, 998, True)
+    """
+    _rouge = False # l'arbre vide est noir
+    hash_consing = False # la couleur ne fait pas partie de la clé de partage
+
+    @classmethod
+    def _noeud(cls, rac, sag, sad, rouge=True):
+        arbre = super()._noeud(rac, sag, sad)
+        arbre._rouge = rouge
+        return arbre
+
+    @classmethod
+    def _noir(cls, arbre):
+        """
+        :return: (AbrRougeNoir) une copie noire du nœud arbre
+        """
+        return cls._noeud(arbre.get_data(), arbre.get_left_subtree(), arbre.get_right_subtree(), False)
+
+    def _reconstruit(self, noeud, rac, sag, sad):
+        return self._equilibre(rac, noeud._rouge, sag, sad)
+
+    @classmethod
+    def _equilibre(cls, rac, rouge, sag, sad):
+        """
+        :return: (AbrRougeNoir) l'arbre (rac, sag, sad) ; si ce nœud est noir
+                 et qu'un fils rouge a lui-même un fils rouge, les trois nœuds
+                 sont réorganisés en un nœud rouge de deux fils noirs
+        """
+        if not rouge:
+            if sag._rouge:
+                g, d = sag.get_left_subtree(), sag.get_right_subtree()
+                if g._rouge:
+                    return cls._noeud(sag.get_data(), cls._noir(g), cls._noeud(rac, d, sad, False))
+                if d._rouge:
+                    return cls._noeud(d.get_data(),
+                                      cls._noeud(sag.get_data(), g, d.get_left_subtree(), False),
+                                      cls._noeud(rac, d.get_right_subtree(), sad, False))
+            if sad._rouge:
+                g, d = sad.get_left_subtree(), sad.get_right_subtree()
+                if g._rouge:
+                    return cls._noeud(g.get_data(),
+                                      cls._noeud(rac, sag, g.get_left_subtree(), False),
+                                      cls._noeud(sad.get_data(), g.get_right_subtree(), d, False))
+                if d._rouge:
+                    return cls._noeud(sad.get_data(), cls._noeud(rac, sag, g, False), cls._noir(d))
+        return cls._noeud(rac, sag, sad, rouge)
+
+    def insere(self, elt):
+        arbre = super().insere(elt)
+        return self._noir(arbre) if arbre._rouge else arbre
+
+    @classmethod
+    def _repare_gauche(cls, rac, rouge, x, frere):
+        """
+        Reconstruit le nœud (rac, x, frere) de couleur rouge, où x compte un
+        nœud noir de moins que frere.
+
+        :return: (tuple) le couple (arbre, déficit) où déficit indique si
+                 l'arbre compte encore un nœud noir de moins qu'avant
+        """
+        if frere._rouge:
+            sous_arbre = cls._repare_gauche(rac, True, x, frere.get_left_subtree())[0]
+            return cls._noeud(frere.get_data(), sous_arbre, frere.get_right_subtree(), False), False
+        g, d = frere.get_left_subtree(), frere.get_right_subtree()
+        if d._rouge:
+            return cls._noeud(frere.get_data(), cls._noeud(rac, x, g, False), cls._noir(d), rouge), False
+        if g._rouge:
+            return cls._noeud(g.get_data(),
+                              cls._noeud(rac, x, g.get_left_subtree(), False),
+                              cls._noeud(frere.get_data(), g.get_right_subtree(), d, False),
+                              rouge), False
+        return cls._noeud(rac, x, cls._noeud(frere.get_data(), g, d, True), False), not rouge
+
+    @classmethod
+    def _repare_droite(cls, rac, rouge, frere, x):
+        """
+        Symétrique de _repare_gauche : x, sous-arbre droit, compte un nœud
+        noir de moins que frere.
+        """
+        if frere._rouge:
+            sous_arbre = cls._repare_droite(rac, True, frere.get_right_subtree(), x)[0]
+            return cls._noeud(frere.get_data(), frere.get_left_subtree(), sous_arbre, False), False
+        g, d = frere.get_left_subtree(), frere.get_right_subtree()
+        if g._rouge:
+            return cls._noeud(frere.get_data(), cls._noir(g), cls._noeud(rac, d, x, False), rouge), False
+        if d._rouge:
+            return cls._noeud(d.get_data(),
+                              cls._noeud(frere.get_data(), g, d.get_left_subtree(), False),
+                              cls._noeud(rac, d.get_right_subtree(), x, False),
+                              rouge), False
+        return cls._noeud(rac, cls._noeud(frere.get_data(), g, d, True), x, False), not rouge
+
+    def supprime(self, elt):
+        # chemin : quadruplets (racine, couleur, sous-arbre hors du chemin, à_gauche)
+        chemin = []
+        arbre = self
+        while not arbre.is_empty():
+            rac = arbre.get_data()
+            if elt < rac:
+                chemin.append((rac, arbre._rouge, arbre.get_right_subtree(), True))
+                arbre = arbre.get_left_subtree()
+            elif elt > rac:
+                chemin.append((rac, arbre._rouge, arbre.get_left_subtree(), False))
+                arbre = arbre.get_right_subtree()
+            else:
+                break
+        if arbre.is_empty():
+            return self
+        if not arbre.get_left_subtree().is_empty() and not arbre.get_right_subtree().is_empty():
+            # la clé est remplacée par le maximum du sous-arbre gauche, dont le nœud est retiré
+            elt_max = arbre.get_left_subtree().maximum()
+            chemin.append((elt_max, arbre._rouge, arbre.get_right_subtree(), True))
+            arbre = arbre.get_left_subtree()
+            while not arbre.get_right_subtree().is_empty():
+                chemin.append((arbre.get_data(), arbre._rouge, arbre.get_left_subtree(), False))
+                arbre = arbre.get_right_subtree()
+        # le nœud retiré a au plus un fils, qui est alors une feuille rouge
+        enfant = arbre.get_left_subtree() if arbre.get_right_subtree().is_empty() else arbre.get_right_subtree()
+        if enfant.is_empty():
+            sous_arbre, deficit = enfant, not arbre._rouge
+        else:
+            sous_arbre, deficit = self._noir(enfant), False
+        for rac, rouge, autre, a_gauche in reversed(chemin):
+            if deficit and a_gauche:
+                sous_arbre, deficit = self._repare_gauche(rac, rouge, sous_arbre, autre)
+            elif deficit:
+                sous_arbre, deficit = self._repare_droite(rac, rouge, autre, sous_arbre)
+            elif a_gauche:
+                sous_arbre = self._noeud(rac, sous_arbre, autre, rouge)
+            else:
+                sous_arbre = self._noeud(rac, autre, sous_arbre, rouge)
+        return self._noir(sous_arbre) if sous_arbre._rouge else sous_arbre
+
+
+class AbrTreap(_AbrEquilibre):
+    """
+    Treap : chaque nœud reçoit une priorité aléatoire et l'arbre est un tas
+    pour ces priorités, ce qui lui donne la forme d'un ABR aléatoire quel que
+    soit l'ordre d'insertion. Les priorités sont tirées avec le module random.
+
+    :Exemples:
+
+    >>> a = AbrTreap.from_iterable(range(1000))
+    >>> a.hauteur() < 100
+    True
+    >>> a = a.supprime(10)
+    >>> a.recherche(10), a.size(), a.est_abr()
+    (False, 999, True)
+    """
+    _priorite = float('-inf') # l'arbre vide a la plus faible priorité
+    hash_consing = False # la priorité ne fait pas partie de la clé de partage
+
+    @classmethod
+    def _noeud(cls, rac, sag, sad, priorite=None):
+        arbre = super()._noeud(rac, sag, sad)
+        arbre._priorite = random.random() if priorite is None else priorite
+        return arbre
+
+    def _reconstruit(self, noeud, rac, sag, sad):
+        # seul le nœud qui vient d'être inséré peut avoir une priorité
+        # supérieure à celle de son père : on le remonte par une rotation
+        priorite = noeud._priorite
+        if sag._priorite > priorite:
+            return self._noeud(sag.get_data(), sag.get_left_subtree(),
+                               self._noeud(rac, sag.get_right_subtree(), sad, priorite),
+                               sag._priorite)
+        if sad._priorite > priorite:
+            return self._noeud(sad.get_data(),
+                               self._noeud(rac, sag, sad.get_left_subtree(), priorite),
+                               sad.get_right_subtree(),
+                               sad._priorite)
+        return self._noeud(rac, sag, sad, priorite)
@@ -0,0 +1,113 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+import mmap
+from abr import AbrError
+from binary_tree import BINARY_HEADER, binary_record, read_binary_header
+
+VIDE = -1  # indice de l'arbre vide dans le format binaire
+
+
+class AbrMmap():
+    """
+    Vue en lecture seule d'un ABR enregistré par save_binary, projetée en
+    mémoire avec mmap : l'ouverture ne lit que l'en-tête, et une recherche ne
+    décode que les nœuds du chemin parcouru. Plusieurs processus qui ouvrent
+    le même fichier partagent ses pages, sans reconstruire l'arbre.
+
+    :Exemples:
+
+    >>> import os, tempfile
+    >>> from abr import Abr
+    >>> fichier = os.path.join(tempfile.mkdtemp(), 'abr.bin')
+    >>> Abr.from_iterable([5, 2, 8, 1, 9]).save_binary(fichier)
+    >>> with AbrMmap(fichier) as a:
+    ...     a.recherche(8), a.recherche(4), a.hauteur(), a.size()
+    (True, False, 3, 5)
+    >>> with AbrMmap(fichier) as a:
+    ...     a.minimum(), a.maximum(), a.ordre_infixe()
+    (1, 9, [1, 2, 5, 8, 9])
+    """
+    def __init__(self, filename):
+        """
+        :param filename: (str) nom d'un fichier écrit par save_binary
+        :raise BinaryTreeError: si le fichier n'est pas un arbre binaire valide
+        """
+        with open(filename, 'rb') as source:
+            self._mm = mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            typecode, self._taille, hauteur = read_binary_header(self._mm)
+        except Exception:
+            self._mm.close()
+            raise
+        self._hauteur = hauteur + 1  # même convention que Abr.hauteur
+        self._enreg = binary_record(typecode, self._taille)
+        self._racine = 0 if self._taille else VIDE
+
+    def close(self):
+        self._mm.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _noeud(self, i):
+        """
+        :return: (tuple) le triplet (clé, indice du fils gauche, indice du fils droit) du nœud i
+        """
+        rac, lien = self._enreg.unpack_from(self._mm, BINARY_HEADER.size + i * self._enreg.size)
+        # le fils gauche suit son père, le lien donne le fils droit (0 : aucun)
+        return rac, i + 1 if lien & 1 else VIDE, lien >> 1 or VIDE
+
+    def is_empty(self):
+        return self._racine == VIDE
+
+    def size(self):
+        return self._taille
+
+    def hauteur(self):
+        return self._hauteur
+
+    def recherche(self, elt):
+        noeud = self._noeud
+        i = self._racine
+        while i != VIDE:
+            rac, gauche, droite = noeud(i)
+            if elt == rac:
+                return True
+            elif elt <= rac:
+                i = gauche
+            else:
+                i = droite
+        return False
+
+    def minimum(self):
+        if self._racine == VIDE:
+            raise AbrError("l'arbre vide n'a pas de minimum")
+        rac, gauche, _ = self._noeud(self._racine)
+        while gauche != VIDE:
+            rac, gauche, _ = self._noeud(gauche)
+        return rac
+
+    def maximum(self):
+        if self._racine == VIDE:
+            raise AbrError("l'arbre vide n'a pas de maximum")
+        rac, _, droite = self._noeud(self._racine)
+        while droite != VIDE:
+            rac, _, droite = self._noeud(droite)
+        return rac
+
+    def ordre_infixe(self):
+        noeud = self._noeud
+        res = []
+        pile = []
+        i = self._racine
+        while pile or i != VIDE:
+            while i != VIDE:
+                rac, gauche, droite = noeud(i)
+                pile.append((rac, droite))
+                i = gauche
+            rac, i = pile.pop()
+            res.append(rac)
+        return res
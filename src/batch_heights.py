@@ -0,0 +1,85 @@
+import numpy as np
+
+# Simulation vectorisée des hauteurs d'ABR aléatoires, sans construire de nœuds.
+#
+# Quand on insère x dans un ABR, son prédécesseur p et son successeur s parmi les
+# clés déjà insérées sont voisins dans l'ordre infixe : l'un est l'ancêtre de l'autre
+# et x devient le fils du plus profond des deux, d'où profondeur(x) = 1 + max(p(p), p(s)).
+# Les couples (p, s) de toutes les insertions s'obtiennent en retirant les clés d'une
+# liste doublement chaînée dans l'ordre inverse des insertions. Chaque étape est
+# vectorisée sur toutes les permutations (une ligne de la matrice par essai).
+#
+# Seul l'axe des essais est vectorisé : les insertions dépendent les unes des autres
+# et restent 2*size étapes successives par paquet d'au plus MAX_CELLS // size essais.
+# Aux grandes tailles, les paquets sont petits (41 essais pour size = 10**5) et le gain
+# sur Abr retombe à quelques fois : environ 5 s contre 19 s pour 10 arbres de taille 10**5.
+
+MAX_CELLS = 2**22 # nombre maximal de cases (essais x taille) traitées en une fois
+
+def _simulate(size, trials, rng):
+    '''
+    return the couple (heights, prefixSums) for trials random trees of the given size :
+    heights (array of length trials) are the final heights (hauteur() of Abr, 0 for the empty tree),
+    prefixSums[i] (array of length size) is the sum over the trials of the heights after i+1 insertions
+    '''
+    rows = np.arange(trials)
+    perm = rng.permuted(np.tile(np.arange(1, size+1, dtype=np.int32), (trials, 1)), axis=1) # clé k à la position k+1
+    # positions 0 et size+1 : sentinelles aux deux bouts de la liste chaînée
+    prev = np.tile(np.arange(-1, size+1, dtype=np.int32), (trials, 1))
+    nxt = prev + 2
+    pred = np.empty((trials, size), dtype=np.int32)
+    succ = np.empty((trials, size), dtype=np.int32)
+    for t in range(size-1, -1, -1):
+        pos = perm[:, t]
+        p = prev[rows, pos]
+        s = nxt[rows, pos]
+        pred[:, t] = p
+        succ[:, t] = s
+        nxt[rows, p] = s
+        prev[rows, s] = p
+    del prev, nxt
+    depth = np.full((trials, size+2), -1, dtype=np.int32) # les sentinelles sont à la profondeur -1
+    heights = np.zeros(trials, dtype=np.int32)
+    prefixSums = np.empty(size, dtype=np.int64)
+    for t in range(size):
+        d = np.maximum(depth[rows, pred[:, t]], depth[rows, succ[:, t]]) + 1
+        depth[rows, perm[:, t]] = d
+        np.maximum(heights, d + 1, out=heights)
+        prefixSums[t] = heights.sum()
+    return heights, prefixSums
+
+def _chunks(size, trials):
+    '''
+    split trials in chunks small enough to keep the (chunk x size) matrices under MAX_CELLS cells
+    '''
+    chunk = max(1, MAX_CELLS // max(size, 1))
+    return [min(chunk, trials - start) for start in range(0, trials, chunk)]
+
+def batchTreeHeights(size, trials, rng=None):
+    '''
+    return the array of the heights of trials random trees of the given size (random insertion orders)
+    rng is a numpy Generator (a new one is created if None)
+    the trials are vectorized, not the insertions: the cost grows with size even for a few trials (see above)
+    '''
+    rng = rng if rng is not None else np.random.default_rng()
+    if size == 0 or trials == 0:
+        return np.zeros(trials, dtype=np.int32)
+    return np.concatenate([_simulate(size, chunk, rng)[0] for chunk in _chunks(size, trials)])
+
+def batchPrefixHeights(size, trials, rng=None):
+    '''
+    return the array of the average heights after 1..size insertions of trials random insertion orders
+    (same estimator as simulation.averagePrefixHeights)
+    '''
+    rng = rng if rng is not None else np.random.default_rng()
+    sums = np.zeros(size, dtype=np.int64)
+    for chunk in _chunks(size, trials):
+        sums += _simulate(size, chunk, rng)[1]
+    return sums / trials
+
+def heightDistribution(size, trials, rng=None):
+    '''
+    return the dict {height: number of trees} of the heights of trials random trees of the given size
+    '''
+    values, counts = np.unique(batchTreeHeights(size, trials, rng), return_counts=True)
+    return dict(zip(values.tolist(), counts.tolist()))
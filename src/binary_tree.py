@@ -51,33 +51,127 @@ Traceback (most recent call last):
 BinaryTreeError: bad arguments type for binary tree building
 """.format(__author__, __date_creation__)
 
+import gc
+import io
+import os
+import re
+import struct
 import time
-import graphviz
+import weakref
+from collections import deque
+# graphviz, and the modules only needed to cache images, are imported by the methods
+# that render images (save, show, _repr_png_)
 
 WHITE = '#FFFFFF'
 BLACK = '#000000'
+PNG_CACHE_DIR = None # images rendered by save and _repr_png_ (None: binary_tree_png in the temporary directory)
+DISPLAY_MAX_DEPTH = 12 # depth at which _repr_png_ cuts the trees
+
+def png_cache_dir():
+    '''
+    return the directory of the images cached by save and _repr_png_ (PNG_CACHE_DIR), created if needed
+    '''
+    import tempfile
+    directory = PNG_CACHE_DIR or os.path.join(tempfile.gettempdir(), 'binary_tree_png')
+    os.makedirs(directory, exist_ok=True)
+    return directory
+
+# caractères recopiés tels quels par escape_str : l'ASCII imprimable sauf le guillemet
+_NON_ECHAPPE = re.compile(r'[^\x20\x21\x23-\x7e]')
 
 def escape_str(obj):
     '''
     convertit l'objet obj en une chaîne de caractères ASCII
     fct utile pour méthode to_dot des BinaryTree
+
+    >>> print(escape_str('a"é'))
+    a\\x0022\\x00E9
     '''
-    chaine = str(obj)
-    chaine_echap = ''
-    for c in chaine:
-        n = ord(c)
-        if 32 <= n <= 126 and c != '"':
-            chaine_echap += c
-        else:
-            chaine_echap += '\\x{:04X}'.format(n)
-    return chaine_echap
+    return _NON_ECHAPPE.sub(lambda m: '\\x{:04X}'.format(ord(m.group())), str(obj))
     
 class BinaryTreeError(Exception):
     def __init__(self, msg):
         self.message = msg
 
+# binary format of save_binary: a header (magic, version, struct code of the
+# data, number of nodes, height) followed by one record (data, link) per node
+# in pre-order, so that the root is record 0 and every child comes after its
+# parent. The left child of node i, if any, is node i + 1: the link only holds
+# the index of the right child (0 if none, the root is nobody's child) shifted
+# left by one, and the lowest bit tells whether there is a left child
+BINARY_MAGIC = b'BTRE'
+BINARY_VERSION = 2
+BINARY_HEADER = struct.Struct('<4sBcxxqq')
+
+def binary_link_code(size):
+    '''
+    :param size: (int) number of nodes of the tree
+    :return: (str) the smallest unsigned struct code holding the links of a tree of this size
+
+    >>> binary_link_code(100), binary_link_code(1000), binary_link_code(10**6)
+    ('B', 'H', 'I')
+    '''
+    for code in 'BHI':
+        if size <= 1 << (8 * struct.calcsize(code) - 1):
+            return code
+    return 'Q'
+
+def binary_record(typecode, size):
+    '''
+    :param typecode: (str) struct code of the data of the nodes ('q' for integers, 'd' for floats)
+    :param size: (int) number of nodes of the tree
+    :return: (struct.Struct) the layout of one node record of the binary format
+    '''
+    try:
+        if len(typecode) != 1:
+            raise struct.error(typecode)
+        return struct.Struct('<' + typecode + binary_link_code(size))
+    except (struct.error, TypeError):
+        raise BinaryTreeError('bad typecode for binary tree file: {!r}'.format(typecode))
+
+def read_binary_header(buffer):
+    '''
+    check the header of a binary tree file against the length of buffer
+
+    :param buffer: (bytes-like) the whole content of the file
+    :return: (tuple) the triple (typecode, number of nodes, height)
+    '''
+    if len(buffer) < BINARY_HEADER.size:
+        raise BinaryTreeError('bad binary tree file')
+    magic, version, typecode, size, height = BINARY_HEADER.unpack_from(buffer)
+    if magic != BINARY_MAGIC or version != BINARY_VERSION:
+        raise BinaryTreeError('bad binary tree file')
+    typecode = typecode.decode('ascii')
+    if len(buffer) != BINARY_HEADER.size + size * binary_record(typecode, size).size:
+        raise BinaryTreeError('truncated binary tree file')
+    return typecode, size, height
+
 
 class BinaryTree():
+    # métadonnées de l'arbre vide, surchargées sur chaque nœud par _set_content
+    _size = 0
+    _height = -1
+    _hash = None # structural hash, computed on first use by __hash__
+
+    # hash-consing mode: when True, building a tree equal to a living tree of
+    # the same class returns that tree, so that equal trees are identical
+    hash_consing = False
+    _interned = weakref.WeakValueDictionary()
+
+    def __new__(cls, *args):
+        if cls.hash_consing:
+            if len(args) == 0:
+                tree = BinaryTree._interned.get((cls,))
+                if tree is None:
+                    tree = super().__new__(cls)
+                    BinaryTree._interned[(cls,)] = tree
+                return tree
+            if len(args) == 3 and isinstance(args[1], BinaryTree) and isinstance(args[2], BinaryTree):
+                tree = cls._lookup_interned(*args)
+                if tree is not None:
+                    return tree
+        return super().__new__(cls)
+
     def __init__(self, *args):
         """
         Binarytree Constructor
@@ -91,7 +185,89 @@ class BinaryTree():
         elif not isinstance(args[1], BinaryTree) or not isinstance(args[2], BinaryTree):
             raise BinaryTreeError('bad arguments type for binary tree building')
         else:
-            self._content = (args[0], args[1], args[2])
+            self._set_content(args[0], args[1], args[2])
+            if self.hash_consing:
+                self._intern()
+
+    @staticmethod
+    def _intern_key(cls, data, left, right):
+        """
+        :return: (tuple) the key of a node in the hash-consing table, None if data is not hashable
+        """
+        key = (cls, type(data), data, id(left), id(right))
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key
+
+    @classmethod
+    def _lookup_interned(cls, data, left, right):
+        """
+        :return: (BinaryTree) the living interned node (data, left, right) of class cls, or None
+        """
+        key = BinaryTree._intern_key(cls, data, left, right)
+        return None if key is None else BinaryTree._interned.get(key)
+
+    def _intern(self):
+        """
+        register this node in the hash-consing table
+        (the children ids in the key stay valid as long as the node lives)
+        """
+        key = BinaryTree._intern_key(type(self), *self._content)
+        if key is not None:
+            BinaryTree._interned.setdefault(key, self)
+
+    def __copy__(self):
+        # trees are never modified once built: a copy is the tree itself
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        """
+        rebuild a pickled tree through the constructor, so that in hash-consing mode
+        the shared empty tree is never overwritten and equal nodes are interned again
+        (the instance attributes of subclasses, such as colours, are restored afterwards)
+
+        >>> import copy, pickle
+        >>> BinaryTree.hash_consing = True
+        >>> t = BinaryTree(2, BinaryTree(1, BinaryTree(), BinaryTree()), BinaryTree(3, BinaryTree(), BinaryTree()))
+        >>> copy.copy(t) is t, copy.deepcopy(t) is t
+        (True, True)
+        >>> pickle.loads(pickle.dumps(t)) is t
+        True
+        >>> print(t), BinaryTree().is_empty()
+        (2, (1, (), ()), (3, (), ()))
+        (None, True)
+        >>> BinaryTree.hash_consing = False
+        >>> u = pickle.loads(pickle.dumps(t))
+        >>> u == t, u is t
+        (True, False)
+        """
+        args = () if self._content is None else self._content
+        return (type(self), args, self.__dict__)
+
+    def _set_content(self, data, left, right):
+        """
+        set the root node of this tree and compute its cached metadata once
+
+        :param data: (any) value of the root node
+        :param left: (BinaryTree) left child tree
+        :param right: (BinaryTree) right child tree
+        """
+        self._content = (data, left, right)
+        self._size = 1 + left._size + right._size
+        self._height = 1 + max(left._height, right._height)
+
+    @classmethod
+    def _node(cls, data, left, right):
+        """
+        build the node (data, left, right) from children already checked,
+        used by load_binary (subclasses may skip the checks of the constructor)
+        """
+        return cls(data, left, right)
 
     @staticmethod
     def _is_atomic(expression):
@@ -101,28 +277,68 @@ class BinaryTree():
         """
         return "," not in expression
 
+    # a token of a prefix expression: a parenthesis, a comma or an atom
+    _TOKEN = re.compile(r'[(),]|[^(),]+')
+
     @staticmethod
-    def _sub_expressions(expression):
-        """
-        :param expression: (str) an expression
-        :return: (tuple) a tuple of len 3 (head, left expression, right expression)
-        :CU: expression is a valid tree expression
-        """
-        res = []
-        cpt = 0
-        prev = 0
-        i = 0
-        while i < len(expression):
-            if expression[i] == "(":
-                cpt += 1
-            if expression[i] == ")":
-                cpt -= 1
-            if expression[i] == "," and cpt == 0:
-                res.append(expression[prev:i].strip("() "))
-                prev = i+1
-            i += 1
-        res.append(expression[prev:i].strip("() "))
-        return tuple(res)
+    def _parse_prefix(expression):
+        """
+        parse a prefix tree expression in a single pass, without recursion
+
+        :param expression: (str) a prefix expression like "(a, (b, (), ()), c)"
+        :return: (any) the expression as nested tuples (head, left, right), where
+                 atoms are strings and empty expressions ("()" or nothing) are None
+        :raise BinaryTreeError: if expression is not a valid tree expression
+
+        >>> BinaryTree._parse_prefix("(a, (b, (), ()), c)")
+        ('a', ('b', None, None), 'c')
+        """
+        tokens = [token for token in (token.strip() for token in BinaryTree._TOKEN.findall(expression)) if token]
+        if tokens and tokens[0] != '(':
+            # top level triple written without its parentheses
+            tokens = ['('] + tokens + [')']
+        nb_tokens = len(tokens)
+        # frames [head, children] of the node expressions being read
+        stack = []
+        pos = 0
+        while True:
+            token = tokens[pos] if pos < nb_tokens else None
+            if token == '(' and pos + 1 < nb_tokens and tokens[pos+1] == ')':
+                value = None
+                pos += 2
+            elif token == '(':
+                if pos + 1 < nb_tokens and tokens[pos+1] == ',':
+                    head = ''
+                    pos += 2
+                elif pos + 2 < nb_tokens and tokens[pos+1] not in '()' and tokens[pos+2] == ',':
+                    head = tokens[pos+1]
+                    pos += 3
+                else:
+                    raise BinaryTreeError('bad tree expression')
+                stack.append([head, []])
+                continue
+            elif token is None or token in ',)':
+                # empty subexpression, nothing to read
+                value = None
+            else:
+                value = token
+                pos += 1
+            # the value just read completes the expressions above it
+            while True:
+                if not stack:
+                    if pos != nb_tokens:
+                        raise BinaryTreeError('bad tree expression')
+                    return value
+                head, children = stack[-1]
+                children.append(value)
+                separator = ',' if len(children) == 1 else ')'
+                if pos >= nb_tokens or tokens[pos] != separator:
+                    raise BinaryTreeError('bad tree expression')
+                pos += 1
+                if len(children) == 1:
+                    break
+                stack.pop()
+                value = (head, children[0], children[1])
 
     def unify(self, expression ):
         """
@@ -134,6 +350,8 @@ class BinaryTree():
         >>> VIDE = BinaryTree()
         >>> BinaryTree(1, BinaryTree(2, VIDE, VIDE), BinaryTree(3, VIDE, VIDE)).unify("(a, b, c)")
         (True, {'a': 1, 'b': (2, (), ()), 'c': (3, (), ())})
+        >>> VIDE.unify("(a, b, c)")
+        (False, {})
         """
         res = True
         subst = {}
@@ -142,17 +360,25 @@ class BinaryTree():
                 subst[expression] = self
             else:
                 try:
-                    data, left, right = BinaryTree._sub_expressions(expression.strip(")("))
-                    subst[data.strip()] = self.get_data()
-                    res_l, subst_l = self.get_left_subtree().unify(left)
-                    res_r, subst_r = self.get_right_subtree().unify(right)
-                    res = res_l and res_r
-                    if res:
-                        subst.update(subst_l)
-                        subst.update(subst_r)
-                except Exception as e:
-                    res = False
-                    print(e)
+                    pattern = BinaryTree._parse_prefix(expression)
+                except BinaryTreeError:
+                    return False, subst
+                # prefix order, so that bindings in subtrees override those above them
+                stack = [(pattern, self)]
+                while stack:
+                    pattern, tree = stack.pop()
+                    if pattern is None:
+                        continue
+                    if isinstance(pattern, str):
+                        subst[pattern] = tree
+                    elif tree.is_empty():
+                        res = False
+                        break
+                    else:
+                        head, left, right = pattern
+                        subst[head] = tree.get_data()
+                        stack.append((right, tree.get_right_subtree()))
+                        stack.append((left, tree.get_left_subtree()))
         return res, subst
 
     @staticmethod
@@ -161,16 +387,35 @@ class BinaryTree():
         :param prefix: (str) a prefix expression
         :param substitutions: (dict) a dictionary associating key with BinaryTree
         :return: (BinaryTree) a new tree from prefix and substitutions
+
+        Empty subexpressions are replaced by substitutions[''], or by the empty tree
+        if there is no such key.
+
+        >>> str(BinaryTree.from_prefix("(1, (2, (), ()), t)", {'1': 1, '2': 2, 't': BinaryTree()}))
+        '(1, (2, (), ()), ())'
         """
         if BinaryTree._is_atomic(prefix):
-            res = substitutions[ prefix ]
-        else:
-            d, left, right = BinaryTree._sub_expressions(prefix.strip("() "))
-            assert d in substitutions, "{} n'est pas défini".format(d)
-            res = BinaryTree( substitutions[d],
-                              BinaryTree.from_prefix(left, substitutions),
-                              BinaryTree.from_prefix(right, substitutions))
-        return res
+            return substitutions[ prefix ]
+        empty = substitutions[''] if '' in substitutions else BinaryTree()
+        trees = []
+        # a node expression is pushed a second time, flagged True, to be built after its subtrees
+        stack = [(BinaryTree._parse_prefix(prefix), False)]
+        while stack:
+            pattern, ready = stack.pop()
+            if pattern is None:
+                trees.append(empty)
+            elif isinstance(pattern, str):
+                trees.append(substitutions[pattern])
+            elif ready:
+                right = trees.pop()
+                left = trees.pop()
+                trees.append(BinaryTree(substitutions[pattern[0]], left, right))
+            else:
+                assert pattern[0] in substitutions, "{} n'est pas défini".format(pattern[0])
+                stack.append((pattern, True))
+                stack.append((pattern[2], False))
+                stack.append((pattern[1], False))
+        return trees[0]
 
     def is_empty(self):
         """
@@ -209,52 +454,177 @@ class BinaryTree():
         """
         :return: (int) numbre of Nodes in Tree
         """
-        if self.is_empty():
-            return 0
-        else:
-            return 1 + self.get_left_subtree().size() + self.get_right_subtree().size()
-        
+        return self._size
+
+
     def height(self):
         """
         :return: (int) height of that tree
         """
-        if self.is_empty():
-            return -1
-        else:
-            return 1 + max(self.get_left_subtree().height(), self.get_right_subtree().height())
+        return self._height
 
     def __eq__(self, obj):
         """
         :param obj: (any) an object
         :return: (bool) True iff obj is an instance of BinaryTree with same nodes in same order
         """
-        if (isinstance(obj, BinaryTree)):
-            if (self.is_empty()):
-                res = obj.is_empty()
+        if not isinstance(obj, BinaryTree):
+            return False
+        stack = [(self, obj)]
+        while stack:
+            tree1, tree2 = stack.pop()
+            if tree1 is tree2:
+                continue
+            if tree1._size != tree2._size or tree1._height != tree2._height:
+                return False
+            if tree1._hash is not None and tree2._hash is not None and tree1._hash != tree2._hash:
+                return False
+            if not tree1.is_empty():
+                if not tree1.get_data() == tree2.get_data():
+                    return False
+                stack.append((tree1.get_right_subtree(), tree2.get_right_subtree()))
+                stack.append((tree1.get_left_subtree(), tree2.get_left_subtree()))
+        return True
+                
+    def __hash__(self):
+        """
+        :return: (int) a structural hash, consistent with __eq__, computed once per node
+        :CU: the values of the nodes are hashable
+
+        >>> VIDE = BinaryTree()
+        >>> hash(BinaryTree(1, VIDE, VIDE)) == hash(BinaryTree(1, BinaryTree(), BinaryTree()))
+        True
+        >>> BinaryTree.hash_consing = True
+        >>> BinaryTree(1, BinaryTree(), BinaryTree()) is BinaryTree(1, BinaryTree(), BinaryTree())
+        True
+        >>> BinaryTree.hash_consing = False
+        """
+        # subtrees are hashed before their parent, with an explicit stack
+        stack = [self]
+        while stack:
+            tree = stack[-1]
+            if tree._hash is not None:
+                stack.pop()
+            elif tree.is_empty():
+                tree._hash = hash(())
+                stack.pop()
             else:
-                rac = self.get_data()
-                if not obj.is_empty():
-                    res = ( rac == obj.get_data() and
-                            self.get_left_subtree() == obj.get_left_subtree() and
-                            self.get_right_subtree() == obj.get_right_subtree() )
+                left, right = tree.get_left_subtree(), tree.get_right_subtree()
+                if left._hash is None or right._hash is None:
+                    stack.append(left)
+                    stack.append(right)
                 else:
-                    res = False
-        else:
-            res = False
-        return res
-                
+                    tree._hash = hash((tree.get_data(), left._hash, right._hash))
+                    stack.pop()
+        return self._hash
+
     def __str__(self):
         """
         :return: (str) string representation of that tree
         """
-        if self.is_empty():
-            return '()'
-        else:
-            repr_left = str(self.get_left_subtree())
-            repr_right = str(self.get_right_subtree())
-            return '({:s}, {:s}, {:s})'.format(str(self.get_data()), repr_left, repr_right)
+        out = io.StringIO()
+        self.write_prefix(out)
+        return out.getvalue()
+
+    def write_prefix(self, out):
+        """
+        write the string representation of that tree to a text file, in a single
+        pass without recursion
+
+        :param out: (file) a text file object (or io.StringIO)
+        """
+        write = out.write
+        # the stack holds trees still to be written and closing separators
+        stack = [self]
+        while stack:
+            item = stack.pop()
+            if isinstance(item, str):
+                write(item)
+            elif item.is_empty():
+                write('()')
+            else:
+                write('(')
+                write(str(item.get_data()))
+                write(', ')
+                stack.extend((')', item.get_right_subtree(), ', ', item.get_left_subtree()))
 
     __repr__ = __str__
+
+    def iter_in_order(self):
+        """
+        :return: (generator) the values of the nodes in infix order, yielded
+                 one by one with an explicit stack of the current path
+
+        >>> VIDE = BinaryTree()
+        >>> t = BinaryTree(1, BinaryTree(2, VIDE, VIDE), BinaryTree(3, BinaryTree(4, VIDE, VIDE), VIDE))
+        >>> list(t.iter_in_order())
+        [2, 1, 4, 3]
+        """
+        stack = []
+        tree = self
+        while stack or not tree.is_empty():
+            while not tree.is_empty():
+                stack.append(tree)
+                tree = tree.get_left_subtree()
+            tree = stack.pop()
+            yield tree.get_data()
+            tree = tree.get_right_subtree()
+
+    __iter__ = iter_in_order
+
+    def iter_pre_order(self):
+        """
+        :return: (generator) the values of the nodes in prefix order
+
+        >>> VIDE = BinaryTree()
+        >>> t = BinaryTree(1, BinaryTree(2, VIDE, VIDE), BinaryTree(3, BinaryTree(4, VIDE, VIDE), VIDE))
+        >>> list(t.iter_pre_order())
+        [1, 2, 3, 4]
+        """
+        stack = [self]
+        while stack:
+            tree = stack.pop()
+            if not tree.is_empty():
+                yield tree.get_data()
+                stack.append(tree.get_right_subtree())
+                stack.append(tree.get_left_subtree())
+
+    def iter_post_order(self):
+        """
+        :return: (generator) the values of the nodes in postfix order
+
+        >>> VIDE = BinaryTree()
+        >>> t = BinaryTree(1, BinaryTree(2, VIDE, VIDE), BinaryTree(3, BinaryTree(4, VIDE, VIDE), VIDE))
+        >>> list(t.iter_post_order())
+        [2, 4, 3, 1]
+        """
+        # a node is pushed a second time, flagged True, to be yielded after its subtrees
+        stack = [(self, False)]
+        while stack:
+            tree, visited = stack.pop()
+            if visited:
+                yield tree.get_data()
+            elif not tree.is_empty():
+                stack.append((tree, True))
+                stack.append((tree.get_right_subtree(), False))
+                stack.append((tree.get_left_subtree(), False))
+
+    def iter_level_order(self):
+        """
+        :return: (generator) the values of the nodes level by level, from left to right
+
+        >>> VIDE = BinaryTree()
+        >>> t = BinaryTree(1, BinaryTree(2, VIDE, VIDE), BinaryTree(3, BinaryTree(4, VIDE, VIDE), VIDE))
+        >>> list(t.iter_level_order())
+        [1, 2, 3, 4]
+        """
+        queue = deque([self])
+        while queue:
+            tree = queue.popleft()
+            if not tree.is_empty():
+                yield tree.get_data()
+                queue.append(tree.get_left_subtree())
+                queue.append(tree.get_right_subtree())
     
     def is_leaf(self):
         '''
@@ -263,33 +633,97 @@ class BinaryTree():
         return (not self.is_empty() and 
                 self.get_left_subtree().is_empty() and
                 self.get_right_subtree().is_empty())
-    
-    def to_dot(self, background_color=WHITE):
+
+    def save_binary(self, filename, typecode='q'):
         '''
-        :return: (str) dot representation of tree
+        save this tree in a binary file (see BINARY_HEADER): a fixed size record
+        per node, the data followed by a link of 1 to 4 bytes depending on the
+        number of nodes, read back by load_binary or by the memory-mapped view
+        abr_mmap.AbrMmap. With 'q' integers a node takes 12 bytes up to 2**31
+        nodes, 8 with 'i'.
+
+        :param filename: (str) name of the file
+        :param typecode: (str) struct code of the data ('q' for integers, 'd' for floats)
+        :raise BinaryTreeError: if some data cannot be stored with this typecode
+
+        >>> import os, tempfile
+        >>> filename = os.path.join(tempfile.mkdtemp(), 'tree.bin')
+        >>> t = BinaryTree(1, BinaryTree(2, BinaryTree(), BinaryTree()), BinaryTree())
+        >>> t.save_binary(filename)
+        >>> os.path.getsize(filename)
+        42
+        >>> BinaryTree.load_binary(filename) == t
+        True
         '''
-        LIEN = '\t"N({:s})" -> "N({:s})" [color="{:s}", label="{:s}", fontsize="8"];\n'
-        def aux(tree, prefix=''):
-            if tree.is_empty():
-                descr = '\t"N({:s})" [color="{:s}", label=""];\n'.format(prefix,
-                                                                         background_color)
-            else:
-                c = tree.get_data()
-                descr = '\t"N({:s})" [label="{:s}"];\n'.format(prefix, escape_str(c))
-                s_a_g = tree.get_left_subtree()
-                label_lien, couleur_lien = ('0', BLACK) if not s_a_g.is_empty() else ('', background_color)
-                descr = (descr +
-                         aux(s_a_g, prefix+'0') +
-                         LIEN.format(prefix, prefix+'0', couleur_lien, label_lien))
-                s_a_d = tree.get_right_subtree()
-                label_lien, couleur_lien = ('1', BLACK) if not s_a_d.is_empty() else ('', background_color)
-                descr = (descr +
-                         aux(s_a_d, prefix+'1') +
-                         LIEN.format(prefix, prefix+'1', couleur_lien, label_lien))
-
-            return descr
+        record = binary_record(typecode, self._size)
+        buffer = bytearray(BINARY_HEADER.size + self._size * record.size)
+        BINARY_HEADER.pack_into(buffer, 0, BINARY_MAGIC, BINARY_VERSION, typecode.encode('ascii'),
+                                self._size, self._height)
+        pack_into, offset, index = record.pack_into, BINARY_HEADER.size, 0
+        stack = [self] if self._content is not None else []
+        try:
+            while stack:
+                data, left, right = stack.pop()._content
+                # in pre-order, the right child comes after the whole left subtree
+                link = (index + 1 + left._size) << 1 if right._content is not None else 0
+                pack_into(buffer, offset, data, link | (left._content is not None))
+                offset += record.size
+                index += 1
+                if right._content is not None:
+                    stack.append(right)
+                if left._content is not None:
+                    stack.append(left)
+        except struct.error:
+            raise BinaryTreeError('data not storable with typecode {!r}: {!r}'.format(typecode, data))
+        with open(filename, 'wb') as output:
+            output.write(buffer)
+
+    @classmethod
+    def load_binary(cls, filename):
+        '''
+        :param filename: (str) name of a file written by save_binary
+        :return: (BinaryTree) the tree saved in this file, built bottom-up without recursion
+        :raise BinaryTreeError: if the file is not a valid binary tree file
+        '''
+        with open(filename, 'rb') as source:
+            buffer = source.read()
+        typecode, size, _ = read_binary_header(buffer)
+        records = list(binary_record(typecode, size).iter_unpack(memoryview(buffer)[BINARY_HEADER.size:]))
+        del buffer
+        empty = cls()
+        nodes = [None] * size
+        # the nodes built here cannot form cycles: the cyclic garbage collector,
+        # triggered over and over by so many allocations, is paused meanwhile
+        collecting = gc.isenabled()
+        gc.disable()
+        try:
+            # children come after their parent: build the records backwards
+            for index in range(size - 1, -1, -1):
+                data, link = records[index]
+                left = nodes[index + 1] if link & 1 else empty
+                right = nodes[link >> 1] if link >> 1 else empty
+                if left is None or right is None:
+                    raise IndexError(index)
+                nodes[index] = cls._node(data, left, right)
+        except IndexError:
+            raise BinaryTreeError('bad binary tree file')
+        finally:
+            if collecting:
+                gc.enable()
+        return nodes[0] if size else empty
     
-        return '''/*
+    def write_dot(self, out, background_color=WHITE, max_depth=None):
+        '''
+        write the dot representation of tree to the text file object out,
+        node by node, with integer node ids
+
+        :param out: (file object) where the description is written
+        :param background_color: (str) color of the background, also used to hide empty trees
+        :param max_depth: (int) if given, the non empty subtrees at this depth are drawn
+                          as a single triangle labelled with their number of nodes
+        '''
+        write = out.write
+        write('''/*
   Binary Tree
 
   Date: {}
@@ -299,34 +733,114 @@ class BinaryTree():
 digraph G {{
 \tbgcolor="{:s}";
 
-{:s}
-}}
-'''.format(time.strftime('%c'), background_color, aux(self))       
+'''.format(time.strftime('%c'), background_color))
+        NODE = '\t"N{:d}" [label="{:s}"];\n'
+        EMPTY = '\t"N{:d}" [color="{:s}", label=""];\n'
+        HIDDEN = '\t"N{:d}" [shape="triangle", label="{:d}"];\n'
+        LINK = '\t"N{:d}" -> "N{:d}" [color="{:s}", label="{:s}", fontsize="8"];\n'
+        next_id = 1
+        # the stack only holds (tree, id, depth) triples of the nodes still to write
+        stack = [(self, 0, 0)]
+        while stack:
+            tree, node_id, depth = stack.pop()
+            if tree.is_empty():
+                write(EMPTY.format(node_id, background_color))
+            elif depth == max_depth:
+                write(HIDDEN.format(node_id, tree.size()))
+            else:
+                data, left, right = tree._content
+                write(NODE.format(node_id, escape_str(data)))
+                for child, child_id, label in ((left, next_id, '0'), (right, next_id + 1, '1')):
+                    if child.is_empty():
+                        write(LINK.format(node_id, child_id, background_color, ''))
+                    else:
+                        write(LINK.format(node_id, child_id, BLACK, label))
+                stack.append((right, next_id + 1, depth + 1))
+                stack.append((left, next_id, depth + 1))
+                next_id += 2
+        write('\n}\n')
+
+    def to_dot(self, background_color=WHITE, max_depth=None):
+        '''
+        :return: (str) dot representation of tree (see write_dot)
+
+        >>> t = BinaryTree(1, BinaryTree(2, BinaryTree(), BinaryTree()), BinaryTree())
+        >>> print(t.to_dot(max_depth=1).split('*/')[1])
+        <BLANKLINE>
+        <BLANKLINE>
+        digraph G {
+        	bgcolor="#FFFFFF";
+        <BLANKLINE>
+        	"N0" [label="1"];
+        	"N0" -> "N1" [color="#000000", label="0", fontsize="8"];
+        	"N0" -> "N2" [color="#FFFFFF", label="", fontsize="8"];
+        	"N1" [shape="triangle", label="1"];
+        	"N2" [color="#FFFFFF", label=""];
+        <BLANKLINE>
+        }
+        <BLANKLINE>
+        '''
+        out = io.StringIO()
+        self.write_dot(out, background_color, max_depth)
+        return out.getvalue()
+
+    def _render_png(self, filename, background_color, max_depth):
+        '''
+        write the dot representation of tree in filename and render it as PNG,
+        unless an image of the same description is already in the cache (see png_cache_dir)
+
+        :return: (str) the path of the PNG image in the cache
+        '''
+        with open(filename, 'w') as out:
+            self.write_dot(out, background_color, max_depth)
+        # the date comment differs at every call: the key is the hash of what follows it
+        import hashlib
+        import shutil
+        digest = hashlib.sha1()
+        with open(filename, 'rb') as source:
+            for line in source:
+                if line.startswith(b'*/'):
+                    break
+            for chunk in iter(lambda: source.read(1 << 16), b''):
+                digest.update(chunk)
+        cached = os.path.join(png_cache_dir(), digest.hexdigest() + '.png')
+        if not os.path.exists(cached):
+            import graphviz
+            shutil.move(graphviz.render('dot', 'png', filename), cached)
+        return cached
 
     def _repr_png_(self):
         """
+        image of the tree displayed by notebooks, cut at DISPLAY_MAX_DEPTH
         """
-        self.save('tree')
-        return open('tree.png', 'rb').read()
+        filename = os.path.join(png_cache_dir(), 'repr-{:d}.dot'.format(os.getpid()))
+        try:
+            with open(self._render_png(filename, WHITE, DISPLAY_MAX_DEPTH), 'rb') as image:
+                return image.read()
+        finally:
+            os.remove(filename)
     
     
-    def show(self, filename='tree', background_color=WHITE):
+    def show(self, filename='tree', background_color=WHITE, max_depth=None):
         '''
         visualise l'tree et produit deux fichiers : filename et filename.png
         le premier contenant la description de l'tree au format dot, 
         le second contenant l'image au format PNG.
         '''
-        descr = self.to_dot(background_color=background_color)
-        graphviz.Source(descr, format='png').view(filename=filename)
+        import graphviz
+        self.save(filename, background_color, max_depth)
+        graphviz.view(filename + '.png')
     
 
-    def save(self, filename='tree', background_color=WHITE):
+    def save(self, filename='tree', background_color=WHITE, max_depth=None):
         '''
         produit deux fichiers : filename et filename.png
         le premier contenant la description de l'tree au format dot, 
         le second contenant l'image au format PNG.
+        l'image est reprise du cache (png_cache_dir) si le même arbre y a déjà été dessiné.
         '''
-        graphviz.Source(self.to_dot(background_color=background_color), format='png').render(filename=filename)
+        import shutil
+        shutil.copyfile(self._render_png(filename, background_color, max_depth), filename + '.png')
 
 if __name__ == '__main__':
    import doctest
@@ -0,0 +1,89 @@
+import heapq
+import numpy as np
+
+# Ajustements des hauteurs moyennes : chaque modèle est calculé une seule fois, en
+# O(N log N) au plus (le tri de la méthode de Mayer), puis évalué d'un bloc sur des
+# tableaux NumPy.
+
+ALPHA = 4.311070407001 # constantes théoriques (Reed, Devroye) de la hauteur d'un ABR aléatoire :
+BETA = 1.953023928893 # hauteur(n) = ALPHA*ln(n) - BETA*ln(ln(n)) + O(1)
+
+def pointMoyen(Mi: list[tuple]) -> tuple[float]:
+    """
+    Renvoie les coordonnées du point moyen d'un nuage de points (sous la forme d'une liste triée de coordonnées (x, y)).
+    """
+    return (sum(M[0] for M in Mi)/len(Mi),
+            sum(M[1] for M in Mi)/len(Mi))
+
+def mayerAdjustment(x: list[float], y: list[float]) -> tuple[float]:
+    """
+    Renvoie les coefficients de la droite d'ajustement selon la méthode de Mayer
+    """
+    x, y = np.asarray(x, dtype=float), np.asarray(y, dtype=float)
+    ordre = np.lexsort((y, x)) # tri des points (x, y), comme celui des couples de coordonnées
+    x, y = x[ordre], y[ordre]
+    m = len(x)//2
+    xa, ya = x[:m].mean(), y[:m].mean() #Point moyen groupe des bottom 50 (50% des valeurs inférieures)
+    xb, yb = x[m:].mean(), y[m:].mean() #Point moyen groupe des top 50 (50% des valeurs supérieures)
+    a = (yb - ya) / (xb - xa) # Coefficient a dans ax+b
+    b = ya - a*xa # Reste b dans ax + b
+    return (float(a), float(b))
+
+def regressionLineaire(x: list[float], y: list[float]):
+    """
+    Renvoie les coefficients de la droite d'ajustement selon la méthode de la régression linéaire
+    """
+    x, y = np.asarray(x, dtype=float), np.asarray(y, dtype=float)
+    dx, dy = x - x.mean(), y - y.mean()
+    varianceX = np.dot(dx, dx)
+    varianceY = np.dot(dy, dy)
+    covarianceXY = np.dot(dx, dy)
+    a = covarianceXY/varianceX
+    b = y.mean()-(a*(x.mean()))
+    r2 = covarianceXY**2/(varianceX*varianceY) if varianceY else 1.0 #Coefficient r2, plus il est proche de 1, meilleur est la régression linéaire
+    return (float(a), float(b), float(r2))
+
+def lineValues(coefficients, x):
+    """
+    Renvoie le tableau des valeurs a*x+b pour les coefficients (a, b, ...) d'une droite d'ajustement
+    """
+    return coefficients[0]*np.asarray(x, dtype=float) + coefficients[1]
+
+def heightModelValues(coefficients, sizes):
+    """
+    Renvoie le tableau des hauteurs alpha*ln(n) - beta*ln(ln(n)) + gamma du modèle théorique, pour les
+    coefficients (alpha, beta, gamma) et les tailles n de sizes (nan pour n = 1, où ln(ln(n)) n'est pas défini)
+    """
+    alpha, beta, gamma = coefficients
+    logs = np.log(np.asarray(sizes, dtype=float))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        values = alpha*logs - beta*np.log(logs) + gamma
+    return np.where(logs > 0, values, np.nan)
+
+def heightModelAdjustment(sizes: list[int], y: list[float]) -> tuple[float]:
+    """
+    Renvoie les coefficients (alpha, beta, gamma) du modèle alpha*ln(n) - beta*ln(ln(n)) + gamma ajusté
+    par moindres carrés sur les hauteurs moyennes y des tailles sizes (les tailles n = 1 sont ignorées)
+
+    >>> sizes = np.arange(2, 1000)
+    >>> [round(c, 6) for c in heightModelAdjustment(sizes, heightModelValues((ALPHA, BETA, -1.5), sizes))]
+    [4.31107, 1.953024, -1.5]
+    """
+    sizes, y = np.asarray(sizes, dtype=float), np.asarray(y, dtype=float)
+    garde = sizes > 1
+    logs = np.log(sizes[garde])
+    colonnes = np.column_stack((logs, -np.log(logs), np.ones_like(logs)))
+    alpha, beta, gamma = np.linalg.lstsq(colonnes, y[garde], rcond=None)[0]
+    return (float(alpha), float(beta), float(gamma))
+
+def nMaxValues(liste):
+    """
+    Renvoie le dixième des valeurs de liste les plus grandes, par ordre décroissant
+    """
+    return heapq.nlargest(len(liste)//10, liste)
+
+def nMinValues(liste):
+    """
+    Renvoie le dixième des valeurs de liste les plus petites, par ordre croissant
+    """
+    return heapq.nsmallest(len(liste)//10, liste)
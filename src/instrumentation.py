@@ -0,0 +1,208 @@
+import functools
+import random
+from abr import Abr
+from binary_tree import BinaryTree
+from running_stats import RunningStats
+
+# Instrumentation à la demande des arbres : les compteurs ne sont branchés que dans un
+# bloc `with counting()` : le temps du bloc, quelques méthodes de BinaryTree et
+# d'Abr sont remplacées par des versions qui comptent. Hors de ces blocs, le code des
+# arbres est exactement celui d'origine : aucun surcoût quand l'instrumentation est éteinte.
+#
+# Les comparaisons de clés sont faites par les clés elles-mêmes : elles ne sont comptées
+# que si l'une des deux clés comparées est une CountedKey.
+
+_active = [] # Counters des blocs counting() en cours, du plus externe au plus interne
+_patches = [] # (classe, nom, méthode d'origine) des méthodes remplacées
+_depth = 0 # profondeur d'appel des opérations comptées (insere appelle parfois insere)
+
+OPERATIONS = ('insere', 'recherche', 'supprime') # opérations dont les appels sont comptés
+
+
+class Counters():
+    '''
+    counts of the events observed inside a counting() block
+
+    comparisons: comparisons involving a CountedKey
+    constructions: tree nodes built (through the constructor or the trusted Abr._noeud)
+    estAbrCalls: calls of Abr.est_abr
+    visits: node values read with get_data, i.e. nodes visited by the algorithms of Abr
+    calls: top-level calls of insere, recherche and supprime
+    '''
+    FIELDS = ('comparisons', 'constructions', 'estAbrCalls', 'visits', 'calls')
+
+    def __init__(self):
+        for field in Counters.FIELDS:
+            setattr(self, field, 0)
+
+    def asDict(self):
+        return {field: getattr(self, field) for field in Counters.FIELDS}
+
+    def perCall(self):
+        '''
+        return the dict of the counts divided by the number of top-level calls of insere, recherche and supprime
+        '''
+        calls = self.calls or 1
+        return {field: getattr(self, field) / calls for field in Counters.FIELDS if field != 'calls'}
+
+    def __repr__(self):
+        return "Counters({})".format(", ".join("{}={}".format(k, v) for k, v in self.asDict().items()))
+
+
+def _count(field):
+    for counters in _active:
+        setattr(counters, field, getattr(counters, field) + 1)
+
+
+class CountedKey():
+    '''
+    key whose comparisons are counted by the active counting() blocks
+
+    >>> a = Abr.from_iterable([CountedKey(k) for k in [4, 2, 6, 1, 3, 5, 7]])
+    >>> with counting() as c:
+    ...     a.recherche(3)
+    True
+    >>> c.comparisons, c.visits, c.calls
+    (5, 3, 1)
+    '''
+    __slots__ = ('value',)
+
+    def __init__(self, value):
+        self.value = value
+
+    def __eq__(self, other):
+        _count('comparisons')
+        return self.value == (other.value if isinstance(other, CountedKey) else other)
+
+    def __ne__(self, other):
+        _count('comparisons')
+        return self.value != (other.value if isinstance(other, CountedKey) else other)
+
+    def __lt__(self, other):
+        _count('comparisons')
+        return self.value < (other.value if isinstance(other, CountedKey) else other)
+
+    def __le__(self, other):
+        _count('comparisons')
+        return self.value <= (other.value if isinstance(other, CountedKey) else other)
+
+    def __gt__(self, other):
+        _count('comparisons')
+        return self.value > (other.value if isinstance(other, CountedKey) else other)
+
+    def __ge__(self, other):
+        _count('comparisons')
+        return self.value >= (other.value if isinstance(other, CountedKey) else other)
+
+    def __hash__(self):
+        return hash(self.value)
+
+    def __repr__(self):
+        return repr(self.value)
+
+    def __str__(self):
+        return str(self.value)
+
+
+def _countEvent(method, field):
+    @functools.wraps(method)
+    def counted(*args, **kwargs):
+        _count(field)
+        return method(*args, **kwargs)
+    return counted
+
+def _countCall(method):
+    @functools.wraps(method)
+    def counted(*args, **kwargs):
+        global _depth
+        if _depth == 0:
+            _count('calls')
+        _depth += 1
+        try:
+            return method(*args, **kwargs)
+        finally:
+            _depth -= 1
+    return counted
+
+def _subclasses(cls):
+    '''
+    return cls and all its subclasses
+    '''
+    classes, stack = [], [cls]
+    while stack:
+        cls = stack.pop()
+        classes.append(cls)
+        stack.extend(cls.__subclasses__())
+    return classes
+
+def _patch(cls, name, wrapper):
+    _patches.append((cls, name, cls.__dict__[name]))
+    setattr(cls, name, wrapper(cls.__dict__[name]))
+
+def _install():
+    # _set_content de BinaryTree est appelé une fois par nœud construit, y compris par Abr._set_content
+    _patch(BinaryTree, '_set_content', lambda m: _countEvent(m, 'constructions'))
+    _patch(BinaryTree, 'get_data', lambda m: _countEvent(m, 'visits'))
+    _patch(Abr, 'est_abr', lambda m: _countEvent(m, 'estAbrCalls'))
+    for cls in _subclasses(Abr):
+        for name in OPERATIONS:
+            if name in cls.__dict__:
+                _patch(cls, name, _countCall)
+
+def _uninstall():
+    while _patches:
+        cls, name, method = _patches.pop()
+        setattr(cls, name, method)
+
+
+class counting():
+    '''
+    context manager counting the operations of the trees run inside its block, returns a Counters
+    blocks can be nested, the events of an inner block are also counted by the outer ones
+    '''
+    def __enter__(self):
+        if not _active:
+            _install()
+        self.counters = Counters()
+        _active.append(self.counters)
+        return self.counters
+
+    def __exit__(self, *exc):
+        _active.remove(self.counters)
+        if not _active:
+            _uninstall()
+
+
+class SearchProfile():
+    '''
+    hook for simulation.treeHeightStats: on every tree, count the comparisons and visited nodes of
+    nbProbes successful searches of random keys, to compare the search cost to the height of the tree
+
+    >>> from simulation import treeHeightStats
+    >>> profile = SearchProfile(50, random.Random(1))
+    >>> stats = treeHeightStats(100, 20, hook=profile)
+    >>> profile.heights.count, profile.visits.count
+    (20, 20)
+    >>> profile.visits.mean < profile.heights.mean
+    True
+    '''
+    def __init__(self, nbProbes=100, rng=random):
+        self.nbProbes = nbProbes
+        self.rng = rng
+        self.heights = RunningStats()
+        self.comparisons = RunningStats() # nombre moyen de comparaisons par recherche, arbre par arbre
+        self.visits = RunningStats() # nombre moyen de nœuds visités par recherche, arbre par arbre
+        self.points = [] # (hauteur, visites moyennes) de chaque arbre
+
+    def __call__(self, tree):
+        if tree.is_empty():
+            return
+        probes = [CountedKey(key) for key in self.rng.choices(tree.ordre_infixe(), k=self.nbProbes)]
+        with counting() as counters:
+            for key in probes:
+                tree.recherche(key)
+        comparisons, visits = counters.comparisons / self.nbProbes, counters.visits / self.nbProbes
+        self.heights.add(tree.hauteur())
+        self.comparisons.add(comparisons)
+        self.visits.add(visits)
+        self.points.append((tree.hauteur(), visits))
@@ -1,71 +1,30 @@
-from timeit import timeit
-from threading import Thread
-import matplotlib.pyplot as plt
-import numpy as np
-from scipy.signal import savgol_filter
-from abr import Abr
-import random
+from simulation import ENGINES, NUMPY_ENGINE, average, heightCurve, parallelHeightStats, averagePrefixHeights
+import argparse
+import csv
+import io
+import json
 import math
-import pandas as pd
-import heapq
+import sys
 
-def randomTreeCreator(size):
-    '''
-    create a binary tree of a given size (nodes number) and return it
-    '''
-    abr = Abr()
-    l = [k for k in range(size)]
-    random.shuffle(l)
-    for i in range(len(l)):
-        abr = abr.insere(l[i])
-    return abr
-
-def average(liste):
-    '''
-    return the average value of the elements's sum in a list
-    '''
-    return sum(liste)/len(liste)
+# matplotlib, scipy et numpy (dont dépend fitting) ne sont importés que par les fonctions qui s'en
+# servent : importer ce module, y compris dans les processus de simulation, reste léger.
+FITTING_NAMES = ('pointMoyen', 'mayerAdjustment', 'regressionLineaire', 'lineValues', 'heightModelAdjustment',
+                 'heightModelValues', 'nMaxValues', 'nMinValues')
 
-def averageTreeHeight(treeSize, n):
+def __getattr__(name):
     '''
-    return the average tree height based on the tree size and the nb of passes
+    give access to the functions of fitting as attributes of this module, importing fitting on first use
     '''
-    return average([randomTreeCreator(treeSize).hauteur() for i in range(n)])
-    
-def pointMoyen(Mi: list[tuple]) -> tuple[float]:
-    """
-    Renvoie les coordonnées du point moyen d'un nuage de points (sous la forme d'une liste triée de coordonnées (x, y)).
-    """
-    return (sum(M[0] for M in Mi)/len(Mi),
-            sum(M[1] for M in Mi)/len(Mi))
+    if name in FITTING_NAMES:
+        import fitting
+        return getattr(fitting, name)
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
 
-def mayerAdjustment(x: list[float], y: list[float]) -> tuple[float]:
-    """
-    Renvoie les coefficients de la droite d'ajustement selon la méthode de Mayer
-    """
-    Mi = [(x[i], y[i]) for i in range(len(x))] #Création des couples de coordonnées
-    Mi.sort()
-    xa, ya = pointMoyen(Mi[:len(Mi)//2]) #Point moyen groupe des bottom 50 (50% des valeurs inférieures)
-    xb, yb = pointMoyen(Mi[len(Mi)//2:]) #Point moyen groupe des top 50 (50% des valeurs supérieures)
-    a = (yb - ya) / (xb - xa) # Coefficient a dans ax+b
-    b = ya - a*xa # Reste b dans ax + b
-    return (a, b)
-
-def regressionLineaire(x: list[float], y: list[float]):
-    """
-    Renvoie les coefficients de la droite d'ajustement selon la méthode de la régression linéaire
-    """
-    varianceX = np.var(x)
-    varianceY = np.var(y)
-    covarianceXY = np.cov(x, y)[0][1]
-    a = covarianceXY/varianceX
-    b = average(y)-(a*(average(x)))
-    r2 = a/varianceY #Coefficient r2, plus il est proche de 1, meilleur est la régression linéaire
-    return (a, b, r2)
-
-def plotter(treeSize, n):
+def plotter(treeSize, n, engine='abr', seed=None, workers=None, sampling='independent', epsilon=None, store=None):
+    import matplotlib.pyplot as plt
+    from scipy.signal import savgol_filter
     x = [i * 1 for i in range(1, treeSize+1)]
-    y = [averageTreeHeight(i, n) for i in range(1, treeSize+1)]
+    y = heightCurve(treeSize, n, engine, seed, workers, sampling, epsilon, store)
     w = savgol_filter(y, treeSize, 2)
     plt.plot(x, w, 'o-', c="orange")
     plt.title("Hauteurs moyennes en fonction de la taille des arbres", fontsize=14)
@@ -74,18 +33,21 @@ def plotter(treeSize, n):
     plt.grid()
     plt.show()
 
-def scatter(treeSize, n):
-    x = [math.log(i) for i in range(1, treeSize+1)]
-    y = [averageTreeHeight(i, n) for i in range(1, treeSize+1)]
-    Coords = [(x[i], y[i]) for i in range(len(x))] #Création des couples de coordonnées
-    Coords.sort()
-    xPointMoyen, yPointMoyen = pointMoyen(Coords) # x et y du point moyen du nuage
-    yMayer = [mayerAdjustment(x, y)[0]*x[i]+(mayerAdjustment(x, y)[1]) for i in range(0, treeSize)] # ax+b with a and b using Mayer's adjustment
-    yRegressionLineaire = [regressionLineaire(x, y)[0]*x[i]+(regressionLineaire(x, y)[1]) for i in range(0, treeSize)] #ax+b with a and b using linear regression's adjustment
+def scatter(treeSize, n, engine='abr', seed=None, workers=None, sampling='independent', epsilon=None, store=None):
+    import matplotlib.pyplot as plt
+    import numpy as np
+    from fitting import mayerAdjustment, regressionLineaire, lineValues, heightModelAdjustment, heightModelValues
+    x = np.log(np.arange(1, treeSize+1))
+    y = heightCurve(treeSize, n, engine, seed, workers, sampling, epsilon, store)
+    xPointMoyen, yPointMoyen = x.mean(), average(y) # x et y du point moyen du nuage
+    mayer = mayerAdjustment(x, y) # chaque ajustement n'est calculé qu'une fois
+    lr = regressionLineaire(x, y)
+    model = heightModelAdjustment(range(1, treeSize+1), y)
     plt.plot(x, y, "o", c="orange", label="Hauteurs moyennes") # Plot des hauteurs moyennes, sous forme d'un nuage de point allongé
-    plt.plot(x, yMayer, "-", c="blue", label="Droite d'ajustement de Mayer / a={:0.3f}, b={:0.3f}".format(mayerAdjustment(x, y)[0], mayerAdjustment(x, y)[1])) # Plot de la droite d'ajustement selon la méthode de Mayer
-    plt.plot(x, yRegressionLineaire, "-", c="green", label="Droite d'ajustement par regression linéaire / a={:0.3f}, b={:0.3f}".format(regressionLineaire(x, y)[0], regressionLineaire(x, y)[1])) # Plot de la droite d'ajustement selon la méthode de régression linéaire
-    plt.plot(xPointMoyen, yPointMoyen, "o", c="red", label="Point moyen / {:0.3f}".format(average(y))) # Plot du point moyen du nuage de point (qui correspond à la hauteur moyenne des arbres)
+    plt.plot(x, lineValues(mayer, x), "-", c="blue", label="Droite d'ajustement de Mayer / a={:0.3f}, b={:0.3f}".format(mayer[0], mayer[1])) # Plot de la droite d'ajustement selon la méthode de Mayer
+    plt.plot(x, lineValues(lr, x), "-", c="green", label="Droite d'ajustement par regression linéaire / a={:0.3f}, b={:0.3f}".format(lr[0], lr[1])) # Plot de la droite d'ajustement selon la méthode de régression linéaire
+    plt.plot(x, heightModelValues(model, range(1, treeSize+1)), "-", c="purple", label="Modèle α ln n - β ln ln n + γ / α={:0.3f}, β={:0.3f}, γ={:0.3f}".format(*model)) # Plot du modèle théorique ajusté
+    plt.plot(xPointMoyen, yPointMoyen, "o", c="red", label="Point moyen / {:0.3f}".format(yPointMoyen)) # Plot du point moyen du nuage de point (qui correspond à la hauteur moyenne des arbres)
     plt.title("Hauteurs moyennes et droites d'ajustement", fontsize=14)
     plt.xlabel("log(taille_arbre)", fontsize=12)
     plt.ylabel("Hauteur moyenne", fontsize=12)
@@ -95,46 +57,197 @@ def scatter(treeSize, n):
     
 ######################################TESTS##############################################################
     
-def nMaxValues(liste):
-    lst = pd.Series(liste)
-    maxValues = lst.nlargest(len(liste)//10).values.tolist()
-    return maxValues
-
-def nMinValues(liste):
-    lst = pd.Series(liste)
-    minValues = lst.nsmallest(len(liste)//10).values.tolist()
-    return minValues
-    
-def main(treeSize, n):
-    listLog = [math.log(i) for i in range(1, treeSize+1)] # Liste des log(n) où n = treeSize
-    y = [averageTreeHeight(i, n) for i in range(1, treeSize+1)]
-    aMayer = mayerAdjustment(listLog, y)[0]
-    bMayer = mayerAdjustment(listLog, y)[1]
-    aLR = regressionLineaire(listLog, y)[0]
-    bLR = regressionLineaire(listLog, y)[1]
-    deltaListMayer = []
-    deltaListLR = []
-    print("Size	|Average Height	|Average Height w/ Mayer's ax+b	|Average Height w/ Linear Regression's ax+b	|Difference w/ Mayer	|Difference w/ LR")
-    for i in range(1, treeSize+1):
-        deltaMayer = y[i-1]-(aMayer*listLog[i-1]+bMayer) # Différence entre la hauteur moyenne d'un arbre PAR LES TESTS et PAR LE CALCUL DE MAYER
-        deltaLR = y[i-1]-(aLR*listLog[i-1]+bLR) # Différence entre la hauteur moyenne d'un arbre PAR LES TESTS et PAR LE CALCUL DE MAYER
-        deltaListMayer.append(deltaMayer)
-        deltaListLR.append(deltaLR)
-        print("{}	|{:0.3f}		|{:0.3f}				|{:0.3f}						|{:0.3f}			|{:0.3f}			".format(i, y[i-1],(aMayer*listLog[i-1]+bMayer), (aLR*listLog[i-1]+bLR), deltaMayer, deltaLR))
-    highestDeltaMayer = []
-    lowestDeltaMayer = []
-    highestDeltaLR = []
-    lowestDeltaLR = []
-    for i in range(len(deltaListLR)):
-        highMayer = max(0-deltaListMayer[i],deltaListMayer[i]-0)
-        highestDeltaMayer.append(highMayer)
-        lowMayer = min(0-deltaListMayer[i],deltaListMayer[i]-0)
-        lowestDeltaMayer.append(lowMayer)
-        highLR = max(0-deltaListLR[i],deltaListLR[i]-0)
-        highestDeltaLR.append(highLR)
-        lowLR = min(0-deltaListLR[i],deltaListLR[i]-0)
-        lowestDeltaLR.append(lowLR)
+def main(treeSize, n, engine='abr', seed=None, workers=None, sampling='independent', epsilon=None, store=None):
+    import numpy as np
+    from fitting import mayerAdjustment, regressionLineaire, lineValues, heightModelAdjustment
+    listLog = np.log(np.arange(1, treeSize+1)) # Liste des log(n) où n = treeSize
+    y = heightCurve(treeSize, n, engine, seed, workers, sampling, epsilon, store)
+    aMayer, bMayer = mayerAdjustment(listLog, y)
+    aLR, bLR = regressionLineaire(listLog, y)[:2]
+    alpha, beta, gamma = heightModelAdjustment(range(1, treeSize+1), y)
+    yMayer = lineValues((aMayer, bMayer), listLog)
+    yLR = lineValues((aLR, bLR), listLog)
+    deltaListMayer = np.asarray(y) - yMayer # Différence entre la hauteur moyenne d'un arbre PAR LES TESTS et PAR LE CALCUL DE MAYER
+    deltaListLR = np.asarray(y) - yLR # Différence entre la hauteur moyenne d'un arbre PAR LES TESTS et PAR LA RÉGRESSION LINÉAIRE
+    lines = ["Size	|Average Height	|Average Height w/ Mayer's ax+b	|Average Height w/ Linear Regression's ax+b	|Difference w/ Mayer	|Difference w/ LR"]
+    row = "{}	|{:0.3f}		|{:0.3f}				|{:0.3f}						|{:0.3f}			|{:0.3f}			".format
+    lines.extend(row(i, y[i-1], yMayer[i-1], yLR[i-1], deltaListMayer[i-1], deltaListLR[i-1]) for i in range(1, treeSize+1))
+    print("\n".join(lines)) # le tableau est écrit d'un bloc
     print("Mayer's a : {:0.3f}, Mayer's b : {:0.3f}".format(aMayer, bMayer))
     print("LR's a : {:0.3f}, LR's b : {:0.3f}".format(aLR, bLR))
-    print("Highest Δ Mayer : {:0.3f} | Lowest Δ Mayer : {:0.3f}".format(max(highestDeltaMayer), max(lowestDeltaMayer)))
-    print("Highest Δ LR : {:0.3f} | Lowest Δ LR : {:0.3f}".format(max(highestDeltaLR), max(lowestDeltaLR)))
+    print("Model α ln n - β ln ln n + γ : α={:0.3f}, β={:0.3f}, γ={:0.3f}".format(alpha, beta, gamma))
+    print("Highest Δ Mayer : {:0.3f} | Lowest Δ Mayer : {:0.3f}".format(np.abs(deltaListMayer).max(), -np.abs(deltaListMayer).min()))
+    print("Highest Δ LR : {:0.3f} | Lowest Δ LR : {:0.3f}".format(np.abs(deltaListLR).max(), -np.abs(deltaListLR).min()))
+
+def compareEngines(treeSize, n, engines=('abr', 'avl', 'rouge_noir', 'treap'), seed=None, workers=None, sampling='independent', epsilon=None, store=None):
+    '''
+    print the average heights of random trees of sizes 1..treeSize for every engine, and plot the curves against log(size)
+    with epsilon, n is the maximal number of trials per size (see simulation.heightCurve)
+    with store (a ResultStore or the path of its file), the curves already computed are read from it
+    '''
+    import matplotlib.pyplot as plt
+    curves = {engine: heightCurve(treeSize, n, engine, seed, workers, sampling, epsilon, store) for engine in engines}
+    print("Size\t|" + "\t|".join(engines))
+    for i in range(1, treeSize+1):
+        print("{}\t|".format(i) + "\t|".join("{:0.3f}".format(curves[engine][i-1]) for engine in engines))
+    x = [math.log(i) for i in range(1, treeSize+1)]
+    for engine in engines:
+        plt.plot(x, curves[engine], "o-", label=engine)
+    plt.title("Hauteurs moyennes selon le type d'arbre", fontsize=14)
+    plt.xlabel("log(taille_arbre)", fontsize=12)
+    plt.ylabel("Hauteur moyenne", fontsize=12)
+    plt.grid()
+    plt.legend()
+    plt.show()
+    return curves
+
+######################################COMMAND LINE##############################################################
+
+def sizeRange(minSize, maxSize, step=1, perDecade=None):
+    '''
+    return the sorted list of the sizes from minSize to maxSize, every step sizes,
+    or about perDecade sizes per power of ten (logarithmic stepping) if perDecade is given
+    '''
+    if perDecade is None:
+        sizes = list(range(minSize, maxSize+1, step))
+    else:
+        count = int(math.log10(maxSize / minSize) * perDecade) + 1
+        sizes = sorted({round(minSize * (maxSize / minSize) ** (k / max(count - 1, 1))) for k in range(count)})
+    if sizes[-1] != maxSize:
+        sizes.append(maxSize)
+    return sizes
+
+def heightTable(sizes, n, engine='abr', seed=None, workers=None, sampling='independent', epsilon=None, store=None):
+    '''
+    return the list of the rows (dict) of the average heights of random trees for every size in sizes
+    the independent sampling rows also give the number of trials, the standard deviation and the 95% confidence interval
+    '''
+    if sampling == 'prefix':
+        if epsilon is not None:
+            raise ValueError("epsilon requires the independent sampling mode")
+        curve = averagePrefixHeights(max(sizes), n, engine, seed, workers)
+        return [{'size': size, 'mean': curve[size-1]} for size in sizes]
+    from results_store import openStore
+    with openStore(store) as opened:
+        stats = parallelHeightStats(sizes, n, engine, seed, workers, epsilon, store=opened)
+    rows = []
+    for size in sizes:
+        low, high = stats[size].confidenceInterval()
+        rows.append({'size': size, 'mean': stats[size].mean, 'trials': stats[size].count,
+                     'stdev': stats[size].stdev(), 'ci_low': low, 'ci_high': high})
+    return rows
+
+def fits(rows):
+    '''
+    return the dict of the Mayer, linear regression and height model fits of the mean heights of rows against log(size)
+    '''
+    import numpy as np
+    from fitting import mayerAdjustment, regressionLineaire, heightModelAdjustment
+    sizes = [row['size'] for row in rows]
+    x, y = np.log(sizes), [row['mean'] for row in rows]
+    res = {}
+    if len(rows) >= 2:
+        res['mayer'] = dict(zip(('a', 'b'), mayerAdjustment(x, y)))
+        res['linear_regression'] = dict(zip(('a', 'b', 'r2'), regressionLineaire(x, y)))
+    if sum(size > 1 for size in sizes) >= 3:
+        res['height_model'] = dict(zip(('alpha', 'beta', 'gamma'), heightModelAdjustment(sizes, y)))
+    return res
+
+def writeCsv(rows, out):
+    writer = csv.DictWriter(out, fieldnames=list(rows[0]))
+    writer.writeheader()
+    writer.writerows(rows)
+
+def jsonSafe(value):
+    '''
+    return a copy of value (nested dicts and lists) where the non-finite floats, such as the infinite
+    confidence bounds of a single trial, are None: json writes them as null instead of invalid Infinity or NaN
+    '''
+    if isinstance(value, dict):
+        return {key: jsonSafe(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [jsonSafe(item) for item in value]
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    return value
+
+def writePng(rows, filename, engine):
+    import matplotlib
+    matplotlib.use('Agg') # pas d'affichage : utilisable sans écran
+    import matplotlib.pyplot as plt
+    from fitting import heightModelValues
+    sizes = [row['size'] for row in rows]
+    means = [row['mean'] for row in rows]
+    if 'ci_low' in rows[0]:
+        plt.fill_between(sizes, [row['ci_low'] for row in rows], [row['ci_high'] for row in rows],
+                         color="orange", alpha=0.3, label="Intervalle de confiance à 95%")
+    plt.plot(sizes, means, "o-", c="orange", markersize=3, label="Hauteurs moyennes ({})".format(engine))
+    model = fits(rows).get('height_model')
+    if model is not None:
+        plt.plot(sizes, heightModelValues((model['alpha'], model['beta'], model['gamma']), sizes), "-", c="purple",
+                 label="Modèle α ln n - β ln ln n + γ / α={alpha:0.3f}, β={beta:0.3f}, γ={gamma:0.3f}".format(**model))
+    plt.xscale("log")
+    plt.title("Hauteurs moyennes en fonction de la taille des arbres", fontsize=14)
+    plt.xlabel("Taille de l'arbre", fontsize=12)
+    plt.ylabel("Hauteur moyenne", fontsize=12)
+    plt.grid()
+    plt.legend()
+    plt.savefig(filename, dpi=150)
+    plt.close()
+
+def cli(argv=None):
+    '''
+    command line entry point: run a height study without any window and write it as CSV, JSON or PNG
+    '''
+    parser = argparse.ArgumentParser(description="Average heights of random binary search trees")
+    parser.add_argument("max_size", type=int, help="largest tree size")
+    parser.add_argument("--min-size", type=int, default=1, help="smallest tree size (default 1)")
+    stepping = parser.add_mutually_exclusive_group()
+    stepping.add_argument("--step", type=int, default=1, help="step between two sizes (default 1)")
+    stepping.add_argument("--per-decade", type=int, help="use logarithmic stepping with this number of sizes per power of ten")
+    parser.add_argument("-n", "--trials", type=int, default=100, help="trees per size (maximum with --epsilon)")
+    parser.add_argument("--engine", default='abr', choices=list(ENGINES) + [NUMPY_ENGINE])
+    parser.add_argument("--workers", type=int, help="worker processes (default: all cores)")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--sampling", default='independent', choices=['independent', 'prefix'])
+    parser.add_argument("--epsilon", type=float, help="stop each size once its 95%% confidence interval is within ±epsilon")
+    parser.add_argument("--store", help="SQLite result store, read first and completed (see results_store)")
+    parser.add_argument("--format", default='csv', choices=['csv', 'json', 'png'])
+    parser.add_argument("-o", "--output", help="output file (default: standard output, heights.png for png)")
+    args = parser.parse_args(argv)
+    if not 1 <= args.min_size <= args.max_size:
+        parser.error("sizes must satisfy 1 <= min-size <= max_size")
+    if args.step < 1:
+        parser.error("--step must be at least 1")
+    if args.per_decade is not None and args.per_decade < 1:
+        parser.error("--per-decade must be at least 1")
+    if args.trials < 1:
+        parser.error("--trials must be at least 1")
+    if args.workers is not None and args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if args.epsilon is not None:
+        if not args.epsilon > 0:
+            parser.error("--epsilon must be positive")
+        if args.sampling != 'independent':
+            parser.error("--epsilon requires the independent sampling mode")
+    sizes = sizeRange(args.min_size, args.max_size, args.step, args.per_decade)
+    rows = heightTable(sizes, args.trials, args.engine, args.seed, args.workers, args.sampling, args.epsilon, args.store)
+    if args.format == 'png':
+        writePng(rows, args.output or 'heights.png', args.engine)
+        return
+    # le résultat est mis en forme en mémoire puis écrit d'un seul bloc
+    out = io.StringIO()
+    if args.format == 'csv':
+        writeCsv(rows, out)
+    else:
+        json.dump(jsonSafe({'engine': args.engine, 'trials': args.trials, 'seed': args.seed, 'sampling': args.sampling,
+                            'epsilon': args.epsilon, 'fits': fits(rows), 'rows': rows}), out, indent=1, allow_nan=False)
+        out.write("\n")
+    if args.output:
+        with open(args.output, 'w', newline='') as f:
+            f.write(out.getvalue())
+    else:
+        sys.stdout.write(out.getvalue())
+
+if __name__ == '__main__':
+    cli()
@@ -0,0 +1,101 @@
+import json
+import sqlite3
+from contextlib import contextmanager
+from running_stats import RunningStats
+
+# Cache disque des résultats de simulation : une ligne par (moteur, taille, nombre d'essais,
+# graine, précision visée), écrite dès que la taille est calculée. Une expérience interrompue
+# reprend là où elle s'était arrêtée, et plotter, scatter et main relisent les mêmes résultats.
+
+DEFAULT_PATH = 'results.sqlite'
+
+_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS heights (
+    engine TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    trials INTEGER NOT NULL,
+    seed INTEGER NOT NULL,
+    epsilon REAL NOT NULL, -- 0 quand tous les essais sont faits
+    count INTEGER NOT NULL,
+    mean REAL NOT NULL,
+    variance REAL NOT NULL,
+    stats TEXT NOT NULL, -- état complet du RunningStats, en JSON
+    PRIMARY KEY (engine, size, trials, seed, epsilon)
+)
+'''
+
+class ResultStore():
+    '''
+    SQLite store of the RunningStats of the tree heights, keyed by (engine, size, trials, seed, epsilon)
+
+    >>> store = ResultStore(':memory:')
+    >>> store.put('abr', {3: RunningStats([2, 3, 3])}, 3, seed=7)
+    >>> store.get('abr', [3, 4], 3, seed=7)
+    {3: RunningStats(count=3, mean=2.667, stdev=0.577)}
+    >>> store.close()
+    '''
+    def __init__(self, path=DEFAULT_PATH):
+        self.path = path
+        self._db = sqlite3.connect(path)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute(_SCHEMA)
+        self._db.commit()
+
+    def close(self):
+        self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def get(self, engine, sizes, trials, seed, epsilon=None):
+        '''
+        return the dict {size: RunningStats} of the sizes of sizes already in the store
+        '''
+        sizes = set(sizes)
+        rows = self._db.execute('SELECT size, stats FROM heights WHERE engine=? AND trials=? AND seed=? AND epsilon=?',
+                                (engine, trials, seed, epsilon or 0))
+        return {size: RunningStats.fromDict(json.loads(stats)) for size, stats in rows if size in sizes}
+
+    def put(self, engine, statsBySize, trials, seed, epsilon=None):
+        '''
+        store the RunningStats of statsBySize (dict {size: RunningStats}) in a single transaction
+        '''
+        with self._db:
+            self._db.executemany('INSERT OR REPLACE INTO heights VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                                 [(engine, size, trials, seed, epsilon or 0, stats.count, stats.mean,
+                                   stats.variance(), json.dumps(stats.asDict()))
+                                  for size, stats in statsBySize.items()])
+
+    def runs(self):
+        '''
+        return the list of (engine, trials, seed, epsilon, number of sizes, largest size) of the stored runs
+        '''
+        return self._db.execute('SELECT engine, trials, seed, epsilon, COUNT(*), MAX(size) FROM heights '
+                                'GROUP BY engine, trials, seed, epsilon ORDER BY engine, trials, seed').fetchall()
+
+
+@contextmanager
+def openStore(store):
+    '''
+    context manager giving the ResultStore of store: a path is opened, and closed at the end of the block,
+    while a ResultStore or None is given back as it is and left open
+
+    >>> with openStore(':memory:') as store:
+    ...     store.runs()
+    []
+    >>> store._db.execute('SELECT 1')
+    Traceback (most recent call last):
+      ...
+    sqlite3.ProgrammingError: Cannot operate on a closed database.
+    '''
+    if not isinstance(store, str):
+        yield store
+        return
+    opened = ResultStore(store)
+    try:
+        yield opened
+    finally:
+        opened.close()
@@ -0,0 +1,125 @@
+from collections import Counter
+from statistics import NormalDist
+import math
+
+# Statistiques en flux (algorithme de Welford) : moyenne et variance sont mises à jour
+# à chaque valeur, sans garder la liste des valeurs ; seul l'histogramme, indexé par
+# hauteur, est conservé, sa taille ne dépend que du nombre de hauteurs distinctes.
+
+class RunningStats():
+    '''
+    streaming accumulator of the mean, variance, extrema and histogram of integer samples (tree heights)
+
+    >>> s = RunningStats([2, 4, 4, 4, 5, 5, 7, 9])
+    >>> s.count, s.mean, s.variance(), s.stdev()
+    (8, 5.0, 4.571428571428571, 2.138089935299395)
+    >>> s.histogram[4], s.min, s.max
+    (3, 2, 9)
+    >>> t = RunningStats([1, 2]).merge(RunningStats([3]))
+    >>> t.count, t.mean, t.variance()
+    (3, 2.0, 1.0)
+    '''
+    def __init__(self, values=()):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0 # somme des carrés des écarts à la moyenne
+        self.min = None
+        self.max = None
+        self.histogram = Counter()
+        self.update(values)
+
+    def add(self, x):
+        '''
+        add the sample x
+        '''
+        self.count += 1
+        delta = x - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (x - self.mean)
+        if self.min is None or x < self.min:
+            self.min = x
+        if self.max is None or x > self.max:
+            self.max = x
+        self.histogram[x] += 1
+
+    def update(self, values):
+        '''
+        add every sample of values
+        '''
+        for x in values:
+            self.add(x)
+        return self
+
+    def merge(self, other):
+        '''
+        add the samples summarized by the accumulator other (Chan et al. pairwise formula) and return self
+        '''
+        if other.count == 0:
+            return self
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self._m2 += other._m2 + delta * delta * self.count * other.count / count
+        self.mean += delta * other.count / count
+        self.count = count
+        self.min = other.min if self.min is None else min(self.min, other.min)
+        self.max = other.max if self.max is None else max(self.max, other.max)
+        self.histogram.update(other.histogram)
+        return self
+
+    def variance(self):
+        '''
+        return the unbiased sample variance (0 for less than two samples)
+        '''
+        return self._m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    def stdev(self):
+        return math.sqrt(self.variance())
+
+    def halfWidth(self, level=0.95):
+        '''
+        return the half-width of the confidence interval of the mean at the given level (normal approximation)
+        infinite for less than two samples
+        '''
+        if self.count < 2:
+            return math.inf
+        z = NormalDist().inv_cdf((1 + level) / 2)
+        return z * self.stdev() / math.sqrt(self.count)
+
+    def confidenceInterval(self, level=0.95):
+        '''
+        return the couple (low, high) of the confidence interval of the mean at the given level
+        '''
+        h = self.halfWidth(level)
+        return (self.mean - h, self.mean + h)
+
+    def converged(self, epsilon, level=0.95, minTrials=30):
+        '''
+        return True when at least minTrials samples were added and the half-width of the confidence interval is below epsilon
+        '''
+        return self.count >= minTrials and self.halfWidth(level) < epsilon
+
+    def asDict(self):
+        '''
+        return the state of the accumulator as a dict of JSON-compatible values (see fromDict)
+        '''
+        return {'count': self.count, 'mean': self.mean, 'm2': self._m2, 'min': self.min, 'max': self.max,
+                'histogram': {str(x): c for x, c in self.histogram.items()}}
+
+    @classmethod
+    def fromDict(cls, state):
+        '''
+        return the accumulator of the given state (see asDict) of integer samples
+
+        >>> s = RunningStats([1, 2, 2, 5])
+        >>> t = RunningStats.fromDict(s.asDict())
+        >>> (t.count, t.mean, t.variance(), t.histogram) == (s.count, s.mean, s.variance(), s.histogram)
+        True
+        '''
+        stats = cls()
+        stats.count, stats.mean, stats._m2 = state['count'], state['mean'], state['m2']
+        stats.min, stats.max = state['min'], state['max']
+        stats.histogram.update({int(x): c for x, c in state['histogram'].items()})
+        return stats
+
+    def __repr__(self):
+        return "RunningStats(count={}, mean={:0.3f}, stdev={:0.3f})".format(self.count, self.mean, self.stdev())
@@ -0,0 +1,290 @@
+from abr import Abr
+from abr_compact import AbrCompact
+from abr_equilibre import AbrAvl, AbrRougeNoir, AbrTreap
+from running_stats import RunningStats
+import random
+import math
+import os
+
+ENGINES = {'abr': Abr, 'compact': AbrCompact, 'avl': AbrAvl, 'rouge_noir': AbrRougeNoir, 'treap': AbrTreap} # Moteurs d'arbres disponibles pour les expériences
+NUMPY_ENGINE = 'numpy' # Moteur vectorisé (batch_heights) : hauteurs simulées sans construire les arbres
+MIN_TRIALS = 30 # Nombre minimal d'essais avant de juger la précision d'une moyenne (mode epsilon)
+STORE_SEED = 0 # Graine utilisée avec un ResultStore quand aucune n'est donnée, pour que les résultats soient réutilisables
+CHECKPOINT_SIZES = 50 # Nombre de tailles calculées entre deux écritures dans le ResultStore
+
+def randomTreeCreator(size, engine='abr', rng=random):
+    '''
+    create a binary tree of a given size (nodes number) with the given engine (a key of ENGINES) and return it
+    the insertion order is shuffled with rng (the random module or a random.Random instance)
+    '''
+    l = [k for k in range(size)]
+    rng.shuffle(l)
+    return ENGINES[engine].from_iterable(l)
+
+def average(liste):
+    '''
+    return the average value of the elements's sum in a list
+    '''
+    return sum(liste)/len(liste)
+
+def _checkEpsilon(epsilon):
+    '''
+    raise ValueError if the precision target epsilon is given but not positive
+    '''
+    if epsilon is not None and not epsilon > 0:
+        raise ValueError("epsilon must be positive: {}".format(epsilon))
+
+def treeHeightStats(treeSize, n, engine='abr', epsilon=None, rng=random, level=0.95, hook=None):
+    '''
+    return the RunningStats of the heights of random trees of size treeSize
+    without epsilon, exactly n trees are built ; with epsilon, trees are built until the half-width of the
+    confidence interval of the mean (at the given level) is below epsilon, n being the maximal number of trees
+    hook, if given, is called on every tree built, e.g. an instrumentation.SearchProfile (not with the numpy engine)
+    raise ValueError if epsilon is not positive
+    '''
+    _checkEpsilon(epsilon)
+    stats = RunningStats()
+    done = lambda: stats.count >= n or (epsilon is not None and stats.converged(epsilon, level, MIN_TRIALS))
+    if engine == NUMPY_ENGINE:
+        import numpy as np # numpy n'est importé que pour ce moteur
+        from batch_heights import batchTreeHeights
+        npRng = np.random.default_rng(rng.randrange(2**32))
+        batch = n if epsilon is None else MIN_TRIALS
+        while not done():
+            stats.update(batchTreeHeights(treeSize, min(batch, n - stats.count), npRng).tolist())
+            batch = stats.count # les lots doublent jusqu'à la précision voulue
+        return stats
+    while not done():
+        tree = randomTreeCreator(treeSize, engine, rng)
+        if hook is not None:
+            hook(tree)
+        stats.add(tree.hauteur())
+    return stats
+
+def averageTreeHeight(treeSize, n, engine='abr', epsilon=None, hook=None):
+    '''
+    return the average tree height based on the tree size and the nb of passes
+    with epsilon, stop as soon as the 95% confidence interval of the average is narrower than ±epsilon (see treeHeightStats)
+    '''
+    return treeHeightStats(treeSize, n, engine, epsilon, hook=hook).mean
+
+def prefixHeights(size, engine='abr', rng=random):
+    '''
+    insert one random permutation of range(size) and return the list of the heights after each insertion
+    heights[i-1] is the height of the tree of the first i keys, which is a random tree of size i
+    the height is known in O(1) after each insertion, so the whole curve costs a single tree build
+    '''
+    abr = ENGINES[engine]()
+    l = [k for k in range(size)]
+    rng.shuffle(l)
+    heights = []
+    for i in range(len(l)):
+        abr = abr.insere(l[i])
+        heights.append(abr.hauteur())
+    return heights
+
+######################################PARALLEL RUNNER##############################################################
+
+def _pool(workers):
+    '''
+    return a pool of workers processes (concurrent.futures is only imported by multi-process runs)
+    '''
+    from concurrent.futures import ProcessPoolExecutor
+    return ProcessPoolExecutor(max_workers=workers)
+
+def taskRng(seed, size, trial, mode='tree'):
+    '''
+    return the random generator of the trial number trial for the given size and sampling mode
+    it only depends on its arguments, so results do not depend on how tasks are spread over workers
+    '''
+    return random.Random("{}:{}:{}:{}".format(mode, seed, size, trial))
+
+def _runShard(engine, seed, tasks):
+    '''
+    worker function : build one random tree per (size, trial) task and return the list of (size, trial, height)
+    '''
+    return [(size, trial, randomTreeCreator(size, engine, taskRng(seed, size, trial)).hauteur())
+            for size, trial in tasks]
+
+def _runNumpyShard(seed, sizes, n):
+    '''
+    worker function : return the list of (size, heights) for the given sizes, n trees per size simulated at once
+    '''
+    import numpy as np
+    from batch_heights import batchTreeHeights
+    return [(size, batchTreeHeights(size, n, np.random.default_rng([seed, size])).tolist()) for size in sizes]
+
+def _runPrefixShard(engine, seed, treeSize, trials):
+    '''
+    worker function : return the sum, size by size, of the prefix heights curves of the given trials
+    '''
+    sums = [0] * treeSize
+    for trial in trials:
+        for i, height in enumerate(prefixHeights(treeSize, engine, taskRng(seed, treeSize, trial, 'prefix'))):
+            sums[i] += height
+    return sums
+
+def _shards(tasks, nbShards):
+    '''
+    split the (size, trial) tasks in about nbShards lists of similar cost (one tree build costs about size*log(size))
+    '''
+    cost = lambda task: task[0] * math.log(task[0] + 2)
+    target = sum(cost(task) for task in tasks) / nbShards
+    shards = []
+    current, currentCost = [], 0
+    for task in tasks:
+        current.append(task)
+        currentCost += cost(task)
+        if currentCost >= target:
+            shards.append(current)
+            current, currentCost = [], 0
+    if current:
+        shards.append(current)
+    return shards
+
+def _runTasks(tasks, engine, seed, workers):
+    '''
+    build the random tree of every (size, trial) task, spread over workers processes (in-process if 1)
+    and return the list of (size, trial, height), in the order of tasks
+    '''
+    if workers == 1:
+        return _runShard(engine, seed, tasks)
+    shards = _shards(tasks, 4 * workers) # plusieurs lots par processus pour équilibrer la charge
+    with _pool(workers) as executor:
+        results = executor.map(_runShard, [engine] * len(shards), [seed] * len(shards), shards)
+        return [result for shard in results for result in shard]
+
+def parallelTreeHeights(sizes, n, engine='abr', seed=None, workers=None):
+    '''
+    return a dict {size: list of the n heights} of random trees built for every size in sizes
+    the trials are shared among workers processes (all cores if None, in-process if 1)
+    with the same seed, the heights are the same whatever the number of workers
+    '''
+    if seed is None:
+        seed = random.randrange(2**32)
+    workers = workers or os.cpu_count() or 1
+    if engine == NUMPY_ENGINE:
+        # toutes les hauteurs d'une même taille sont simulées ensemble, par un seul processus
+        nbShards = min(len(sizes), 4 * workers) or 1
+        shards = [sizes[i::nbShards] for i in range(nbShards)]
+        if workers == 1:
+            results = [_runNumpyShard(seed, sizes, n)]
+        else:
+            with _pool(workers) as executor:
+                results = list(executor.map(_runNumpyShard, [seed] * nbShards, shards, [n] * nbShards))
+        return {size: heights for result in results for size, heights in result}
+    heights = {size: [0] * n for size in sizes}
+    for size, trial, height in _runTasks([(size, trial) for size in sizes for trial in range(n)], engine, seed, workers):
+        heights[size][trial] = height
+    return heights
+
+def _nextTarget(stats, n, epsilon, level):
+    '''
+    return the number of trials to reach for a size whose heights are summarized by stats (mode epsilon)
+    '''
+    if stats.count < MIN_TRIALS:
+        return min(n, MIN_TRIALS)
+    # nombre d'essais pour lequel la demi-largeur estimée passe sous epsilon
+    needed = math.ceil((stats.halfWidth(level) / epsilon) ** 2 * stats.count)
+    return min(n, max(needed, stats.count + MIN_TRIALS))
+
+def parallelHeightStats(sizes, n, engine='abr', seed=None, workers=None, epsilon=None, level=0.95, store=None):
+    '''
+    return a dict {size: RunningStats of the heights} of random trees built for every size in sizes
+    without epsilon, n trees are built per size ; with epsilon, trials are added by rounds to the sizes whose
+    confidence interval (at the given level) is still wider than ±epsilon, up to n trees per size
+    with the same seed, the result is the same whatever the number of workers
+    with a ResultStore, the sizes already stored are read back and the others are computed and stored
+    CHECKPOINT_SIZES at a time, so that an interrupted run resumes where it stopped (seed defaults to STORE_SEED)
+    raise ValueError if epsilon is not positive
+    '''
+    _checkEpsilon(epsilon)
+    if store is not None:
+        if level != 0.95:
+            raise ValueError("the result store only keeps results at the 95% level")
+        seed = STORE_SEED if seed is None else seed
+        stats = store.get(engine, sizes, n, seed, epsilon)
+        missing = [size for size in sizes if size not in stats]
+        for i in range(0, len(missing), CHECKPOINT_SIZES):
+            computed = parallelHeightStats(missing[i:i+CHECKPOINT_SIZES], n, engine, seed, workers, epsilon, level)
+            store.put(engine, computed, n, seed, epsilon)
+            stats.update(computed)
+        return {size: stats[size] for size in sizes}
+    if seed is None:
+        seed = random.randrange(2**32)
+    workers = workers or os.cpu_count() or 1
+    if engine == NUMPY_ENGINE:
+        if epsilon is None:
+            heights = parallelTreeHeights(sizes, n, engine, seed, workers)
+            return {size: RunningStats(heights[size]) for size in sizes}
+        return {size: treeHeightStats(size, n, engine, epsilon, taskRng(seed, size, 0, 'numpy'), level) for size in sizes}
+    stats = {size: RunningStats() for size in sizes}
+    pending = list(sizes)
+    while pending:
+        targets = {size: n if epsilon is None else _nextTarget(stats[size], n, epsilon, level) for size in pending}
+        tasks = [(size, trial) for size in pending for trial in range(stats[size].count, targets[size])]
+        for size, trial, height in _runTasks(tasks, engine, seed, workers):
+            stats[size].add(height)
+        pending = [size for size in pending if stats[size].count < n and
+                   not (epsilon is not None and stats[size].converged(epsilon, level, MIN_TRIALS))]
+    return stats
+
+def parallelAverageHeights(sizes, n, engine='abr', seed=None, workers=None):
+    '''
+    return the list of the average tree heights for every size in sizes, computed with parallelTreeHeights
+    '''
+    heights = parallelTreeHeights(sizes, n, engine, seed, workers)
+    return [average(heights[size]) for size in sizes]
+
+def averagePrefixHeights(treeSize, n, engine='abr', seed=None, workers=None, independent=False):
+    '''
+    return the list of the average tree heights for sizes 1..treeSize, measured on every prefix of n insertion sequences
+    the curves of one trial are correlated between sizes, but each point has the same law as with independent trees
+    if independent is True, return the couple (prefix curve, curve of parallelAverageHeights) to compare both estimators
+    '''
+    if seed is None:
+        seed = random.randrange(2**32)
+    workers = workers or os.cpu_count() or 1
+    if engine == NUMPY_ENGINE:
+        import numpy as np
+        from batch_heights import batchPrefixHeights
+        curve = batchPrefixHeights(treeSize, n, np.random.default_rng([seed, treeSize])).tolist()
+    else:
+        if workers == 1:
+            results = [_runPrefixShard(engine, seed, treeSize, range(n))]
+        else:
+            nbShards = min(n, 4 * workers)
+            shards = [range(i, n, nbShards) for i in range(nbShards)]
+            with _pool(workers) as executor:
+                results = executor.map(_runPrefixShard, [engine] * nbShards, [seed] * nbShards,
+                                       [treeSize] * nbShards, shards)
+        sums = [0] * treeSize
+        for result in results:
+            for i, total in enumerate(result):
+                sums[i] += total
+        curve = [total / n for total in sums]
+    if independent:
+        return curve, parallelAverageHeights(range(1, treeSize+1), n, engine, seed, workers)
+    return curve
+
+def heightCurve(treeSize, n, engine='abr', seed=None, workers=None, sampling='independent', epsilon=None, store=None):
+    '''
+    return the average tree heights for sizes 1..treeSize
+    sampling is 'independent' (new trees for every size and trial) or 'prefix' (see averagePrefixHeights)
+    with epsilon (independent sampling only), each size gets at most n trials, stopping once its average
+    is known within ±epsilon at 95% (see parallelHeightStats)
+    store is a ResultStore or the path of its file : the independent sampling results are read from it when
+    available and added to it otherwise (the prefix sampling, a single pass, is not stored)
+    '''
+    if epsilon is not None and sampling != 'independent':
+        raise ValueError("epsilon requires the independent sampling mode")
+    if sampling == 'independent' and (epsilon is not None or store is not None):
+        from results_store import openStore # sqlite3 n'est importé qu'avec un cache
+        with openStore(store) as opened:
+            stats = parallelHeightStats(range(1, treeSize+1), n, engine, seed, workers, epsilon, store=opened)
+        return [stats[size].mean for size in range(1, treeSize+1)]
+    if sampling == 'prefix':
+        return averagePrefixHeights(treeSize, n, engine, seed, workers)
+    elif sampling == 'independent':
+        return parallelAverageHeights(range(1, treeSize+1), n, engine, seed, workers)
+    raise ValueError("unknown sampling mode: {}".format(sampling))